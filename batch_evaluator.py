@@ -0,0 +1,67 @@
+"""Векторная оценка множества рук за один вызов (numpy).
+
+Использует те же таблицы, что и evaluator.evaluate, поэтому результаты
+совпадают с PokerHand: сила руки и категория (значение HandRank).
+"""
+import numpy as np
+
+import evaluator
+
+# Блоками такого размера обрабатываются руки, чтобы промежуточные
+# массивы не занимали гигабайты памяти на миллионах рук
+CHUNK_SIZE = 1 << 18
+
+_POW5 = np.array([5 ** r for r in range(13)], dtype=np.int64)
+_RANK_BITS = np.array([1 << r for r in range(13)], dtype=np.int32)
+# Количества карт по мастям - восьмеричные разряды ключа мастей;
+# по ключу таблица даёт масть флеша или -1
+_SUIT_KEYS = np.array([8 ** s for s in range(4)], dtype=np.int16)
+_FLUSH_SUIT = np.full(8 ** 4, -1, dtype=np.int8)
+for _key in range(8 ** 4):
+    for _suit in range(4):
+        if (_key >> (3 * _suit)) & 7 >= 5:
+            _FLUSH_SUIT[_key] = _suit
+
+_rank_items = sorted(evaluator.RANK_TABLE.items())
+_RANK_KEYS = np.array([key for key, _ in _rank_items], dtype=np.int64)
+_RANK_STRENGTHS = np.array([strength for _, strength in _rank_items], dtype=np.int32)
+_FLUSH_STRENGTHS = np.array(evaluator.FLUSH_TABLE, dtype=np.int32)
+del _rank_items, _key, _suit
+
+
+def _evaluate_chunk(codes):
+    ranks = codes % 13
+    suits = codes // 13
+
+    keys = _POW5[ranks].sum(axis=1)
+    strengths = _RANK_STRENGTHS[np.searchsorted(_RANK_KEYS, keys)]
+
+    flush_suit = _FLUSH_SUIT[_SUIT_KEYS[suits].sum(axis=1)]
+    rows = np.flatnonzero(flush_suit >= 0)
+    if len(rows):
+        flush_suit = flush_suit[rows]
+        in_suit = suits[rows] == flush_suit[:, None]
+        masks = (_RANK_BITS[ranks[rows]] * in_suit).sum(axis=1)
+        strengths[rows] = _FLUSH_STRENGTHS[masks]
+
+    return strengths
+
+
+def evaluate_batch(codes):
+    """Оценить руки из массива кодов карт формы (N, k), k <= 7.
+
+    Карты в одной строке должны быть различны - это не проверяется.
+    Возвращает два массива длины N: силы рук (сравнимы между собой и с
+    PokerHand.strength) и категории рук (значения HandRank).
+    """
+    codes = np.asarray(codes)
+    if codes.ndim != 2 or codes.shape[1] > 7:
+        raise ValueError(f"Ожидается массив формы (N, k), k <= 7, получен {codes.shape}")
+    codes = codes.astype(np.int16, copy=False)
+
+    strengths = np.empty(len(codes), dtype=np.int32)
+    for start in range(0, len(codes), CHUNK_SIZE):
+        chunk = codes[start:start + CHUNK_SIZE]
+        strengths[start:start + CHUNK_SIZE] = _evaluate_chunk(chunk)
+
+    return strengths, strengths >> evaluator.CATEGORY_SHIFT
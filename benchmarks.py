@@ -0,0 +1,390 @@
+"""Замеры производительности движка и интерфейса.
+
+    python benchmarks.py suite --output results.json
+    python benchmarks.py suite --baseline benchmark_baseline.json
+    python benchmarks.py suite --baseline benchmark_baseline.json --save-baseline
+    python benchmarks.py dealing --hands 20
+
+suite - набор замеров с фиксированными зёрнами: время импорта модулей
+в чистом интерпретаторе (и какие тяжёлые зависимости они подтягивают),
+оценки рук PokerHand в секунду, циклы get_card_for_player + decrypt_card в секунду для каждого
+криптографического профиля, полные раздачи PokerGame в секунду для 2-10
+игроков, время кадра PokerUI.run, процессорное время интерфейса в простое
+(ui.idle_cpu_ms - мс процессора на секунду ожидания ввода) и время полной
+перерисовки вскрытия за столом на 10 игроков (pygame с видеодрайвером
+SDL dummy, окно не открывается). Результат - плоский словарь "замер: значение";
+замеры *_per_sec чем больше, тем лучше, *_ms - чем меньше, тем лучше,
+*_count - справочные и не сравниваются.
+С --baseline результаты сравниваются с сохранёнными, и при ухудшении
+больше порога (--threshold) команда завершается с кодом 1.
+
+dealing - время сдачи (start_new_hand) для 2-10 игроков: последовательно
+и через пул потоков сдачи, с ускорением параллельной сдачи.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from game_logic import PokerGame, PokerHand, DEALING_MODES, CRYPTO_PROFILES
+from deck import Dealer, CARDS, DECK_SIZE
+from player import Player
+import metrics
+import simulate
+
+PLAYER_COUNTS = range(2, 11)
+SUITE = ("imports", "evaluator", "roundtrip", "hands", "ui", "showdown")
+IMPORT_TARGETS = ("game_logic", "deck", "player", "evaluator", "crypto", "ui")
+HEAVY_MODULES = ("pygame", "cryptography", "numpy")
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_SEED = 12345
+
+
+def _time_hands(game, hands):
+    """Медиана времени start_new_hand, мс"""
+    samples = []
+    for _ in range(hands):
+        start = time.perf_counter()
+        game.start_new_hand()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_dealing(player_counts=PLAYER_COUNTS, hands=20, dealing="per_card", crypto="rsa",
+                  workers=None, seed=0):
+    """Сравнить последовательную и параллельную сдачу для каждого числа игроков"""
+    results = []
+    for num_players in player_counts:
+        row = {"players": num_players}
+        for label, deal_workers in (("sequential_ms", 0), ("parallel_ms", workers)):
+            random.seed(seed)
+            game = PokerGame(num_players, dealing=dealing, crypto=crypto,
+                             deal_workers=deal_workers, predeal=False)
+            game.start_new_hand()
+            row[label] = _time_hands(game, hands)
+            game.close()
+        row["speedup"] = row["sequential_ms"] / row["parallel_ms"]
+        results.append(row)
+
+    return {
+        "dealing": dealing,
+        "crypto": crypto,
+        "workers": workers if workers is not None else "auto",
+        "cpu_count": os.cpu_count(),
+        "hands": hands,
+        "results": results,
+    }
+
+
+def bench_imports(targets=IMPORT_TARGETS, runs=5):
+    """Время импорта модулей в новом интерпретаторе (медиана), мс.
+
+    Отдельно печатает в stderr, какие из HEAVY_MODULES загружает каждый
+    модуль: движок (game_logic, deck, player) не должен тянуть ни pygame,
+    ни cryptography.
+    """
+    code = (
+        "import sys, time; start = time.perf_counter(); import {module}; "
+        "elapsed = time.perf_counter() - start; "
+        "print(elapsed, ','.join(m for m in {heavy!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    cwd = os.path.dirname(os.path.abspath(__file__))
+
+    results = {}
+    for module in targets:
+        samples = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, "-c", code.format(module=module, heavy=HEAVY_MODULES)],
+                capture_output=True, text=True, check=True, env=env, cwd=cwd,
+            ).stdout.split()
+            samples.append(float(output[0]) * 1000)
+        heavy = output[1] if len(output) > 1 else "-"
+        print(f"import {module}: {statistics.median(samples):.1f} мс, тяжёлые зависимости: {heavy}",
+              file=sys.stderr)
+        results[f"imports.{module}_ms"] = statistics.median(samples)
+    return results
+
+
+def bench_evaluator(hands=100000, seed=DEFAULT_SEED):
+    """Оценки 7-карточных рук в секунду: PokerHand и пакетный оценщик"""
+    rng = random.Random(seed)
+    deals = [rng.sample(CARDS, 7) for _ in range(hands)]
+
+    start = time.perf_counter()
+    for cards in deals:
+        PokerHand(cards)
+    results = {"evaluator.poker_hand_per_sec": hands / (time.perf_counter() - start)}
+
+    try:
+        import numpy as np
+    except ImportError:
+        return results
+
+    codes = np.array([[card.code for card in cards] for cards in deals], dtype=np.int8)
+    PokerHand.evaluate_batch(codes[:1])
+    start = time.perf_counter()
+    PokerHand.evaluate_batch(codes)
+    results["evaluator.batch_per_sec"] = hands / (time.perf_counter() - start)
+    return results
+
+
+def bench_roundtrip(cards=200, seed=DEFAULT_SEED):
+    """Циклы «дилер шифрует и подписывает карту - игрок расшифровывает и проверяет» в секунду"""
+    results = {}
+    for name in CRYPTO_PROFILES:
+        random.seed(seed)
+        dealer = Dealer(crypto=name)
+        player = Player("Игрок 1", 0, crypto=name)
+        player.dealer_public_key = dealer.public_key
+
+        start = time.perf_counter()
+        for i in range(cards):
+            if i % DECK_SIZE == 0:
+                dealer.initial_shuffle()
+            if len(player.hand) == 2:
+                player.reset_hand()
+            card_enc, signature = dealer.get_card_for_player(player.public_key)
+            player.decrypt_card(card_enc, signature)
+        results[f"roundtrip.{name}_per_sec"] = cards / (time.perf_counter() - start)
+    return results
+
+
+def bench_hands(player_counts=PLAYER_COUNTS, hands=500, secure_hands=20, seed=DEFAULT_SEED):
+    """Полные раздачи в секунду: без шифрования и с шифрованной сдачей по умолчанию"""
+    results = {}
+    for num_players in player_counts:
+        for label, secure, count in (("plain", False, hands), ("secure", True, secure_hands)):
+            random.seed(seed)
+            game = PokerGame(num_players, secure=secure)
+            strategies = [simulate.random_strategy] * num_players
+            for player in game.players:
+                player.chips = 10 ** 9
+
+            start = time.perf_counter()
+            for _ in range(count):
+                simulate.play_hand(game, strategies)
+                game.dealer_position = (game.dealer_position + 1) % num_players
+            elapsed = time.perf_counter() - start
+            game.close()
+            results[f"hands.{label}.{num_players}p_per_sec"] = count / elapsed
+    return results
+
+
+def _headless_pygame():
+    """pygame без окна и звука"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    return pygame
+
+
+def bench_ui(num_players=4, duration=2.0):
+    """Время кадра PokerUI.run с видеодрайвером SDL dummy"""
+    pygame = _headless_pygame()
+    from ui import PokerUI, FramePolicy
+
+    registry = metrics.get_metrics()
+    was_enabled = registry.enabled
+    # Время кадра меряется при непрерывной отрисовке, простой - отдельно
+    game_ui = PokerUI(num_players, frame_policy=FramePolicy("continuous"))
+    game_ui.finish_background()
+    registry.reset()
+    metrics.enable()
+    try:
+        pygame.time.set_timer(pygame.QUIT, int(duration * 1000), 1)
+        game_ui.run()
+        frame = registry.snapshot()["histograms"].get("frame")
+    finally:
+        registry.enabled = was_enabled
+        registry.reset()
+
+    if not frame:
+        return {}
+    return {
+        "ui.frame_mean_ms": frame["mean_us"] / 1000,
+        "ui.frame_p99_ms": frame["p99_us"] / 1000,
+        "ui.frame_count": frame["count"],
+        "ui.idle_cpu_ms": bench_idle(num_players, duration),
+    }
+
+
+def bench_idle(num_players=4, duration=2.0, frame_policy=None):
+    """Процессорное время PokerUI.run без ввода, мс на секунду ожидания"""
+    pygame = _headless_pygame()
+    from ui import PokerUI
+
+    game_ui = PokerUI(num_players, frame_policy=frame_policy)
+    game_ui.finish_background()
+    # Фоновая подготовка следующей раздачи не должна попасть в замер
+    if game_ui.game._next_deal is not None:
+        game_ui.game._next_deal.result()
+
+    pygame.time.set_timer(pygame.QUIT, int(duration * 1000), 1)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    game_ui.run()
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    return cpu * 1000 / wall
+
+
+def bench_showdown(num_players=10, frames=300):
+    """Полная перерисовка экрана вскрытия: все карты открыты, на столе пять общих"""
+    _headless_pygame()
+    from ui import PokerUI
+
+    game_ui = PokerUI(num_players)
+    game_ui.finish_background()
+    game = game_ui.game
+    while game.game_phase != "showdown":
+        game.next_phase()
+    game_ui.start_showdown()
+    game_ui.finish_background()
+    game_ui.render()
+
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        game_ui.full_redraw = True
+        game_ui.render()
+        samples.append((time.perf_counter() - start) * 1000)
+    game_ui.close()
+    return {
+        f"showdown.{num_players}p.frame_median_ms": statistics.median(samples),
+        f"showdown.{num_players}p.frame_p99_ms": sorted(samples)[int(len(samples) * 0.99) - 1],
+    }
+
+
+def run_suite(only=SUITE, quick=False):
+    """Выполнить выбранные замеры набора"""
+    scale = 0.1 if quick else 1
+    benches = {
+        "imports": lambda: bench_imports(runs=3 if quick else 5),
+        "evaluator": lambda: bench_evaluator(hands=int(100000 * scale)),
+        "roundtrip": lambda: bench_roundtrip(cards=max(20, int(200 * scale))),
+        "hands": lambda: bench_hands(hands=max(20, int(500 * scale)),
+                                     secure_hands=max(3, int(20 * scale))),
+        "ui": lambda: bench_ui(duration=0.5 if quick else 2.0),
+        "showdown": lambda: bench_showdown(frames=max(30, int(300 * scale))),
+    }
+    results = {}
+    for name in only:
+        results.update(benches[name]())
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Сравнить с сохранёнными результатами.
+
+    Возвращает список (замер, было, стало, изменение) для замеров, которые
+    ухудшились больше чем на threshold. Замер с неизвестным окончанием
+    имени - ошибка: иначе он молча выпал бы из сравнения.
+    """
+    regressions = []
+    for name, value in results.items():
+        if name.endswith("_count"):
+            continue
+        if not name.endswith(("_per_sec", "_ms")):
+            raise ValueError(f"Неизвестный вид замера: {name}")
+        old = baseline.get(name)
+        if not old:
+            continue
+        change = value / old - 1
+        if name.endswith("_per_sec"):
+            worse = change < -threshold
+        else:
+            worse = change > threshold
+        if worse:
+            regressions.append((name, old, value, change))
+    return regressions
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности покера")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    suite = subparsers.add_parser("suite", help="набор замеров движка и интерфейса")
+    suite.add_argument("--only", default=",".join(SUITE),
+                       help="замеры через запятую: " + ", ".join(SUITE))
+    suite.add_argument("--quick", action="store_true", help="уменьшенные объёмы для быстрой проверки")
+    suite.add_argument("--output", help="записать результаты в JSON-файл")
+    suite.add_argument("--baseline", help="JSON с базовыми результатами для сравнения")
+    suite.add_argument("--save-baseline", action="store_true",
+                       help="записать результаты в файл --baseline")
+    suite.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="допустимое ухудшение (доля, по умолчанию 0.10)")
+
+    dealing = subparsers.add_parser("dealing", help="время сдачи для 2-10 игроков")
+    dealing.add_argument("--hands", type=int, default=20)
+    dealing.add_argument("--dealing", choices=DEALING_MODES, default="per_card")
+    dealing.add_argument("--crypto", choices=CRYPTO_PROFILES, default="rsa")
+    dealing.add_argument("--workers", type=int, default=None,
+                         help="потоков параллельной сдачи (по умолчанию - по числу ядер)")
+
+    args = parser.parse_args(argv)
+    if args.command == "dealing":
+        report = bench_dealing(hands=args.hands, dealing=args.dealing, crypto=args.crypto,
+                               workers=args.workers)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    only = args.only.split(",")
+    unknown = [name for name in only if name not in SUITE]
+    if unknown:
+        parser.error(f"неизвестные замеры: {', '.join(unknown)}")
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline требует --baseline")
+
+    report = run_suite(only, args.quick)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        _write_json(args.output, report)
+    else:
+        print(text)
+
+    if not args.baseline:
+        return 0
+    if args.save_baseline:
+        _write_json(args.baseline, report)
+        print(f"Базовые результаты записаны в {args.baseline}", file=sys.stderr)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Нет базовых результатов {args.baseline}; сохраните их с --save-baseline",
+              file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(report["results"], baseline, args.threshold)
+    for name, old, new, change in regressions:
+        print(f"Ухудшение {name}: {old:.4g} -> {new:.4g} ({change:+.1%})", file=sys.stderr)
+    if regressions:
+        return 1
+    print(f"Ухудшений больше {args.threshold:.0%} нет", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
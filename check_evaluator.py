@@ -0,0 +1,193 @@
+"""Сверка табличного оценщика с прежним алгоритмом PokerHand.evaluate_hand.
+
+    python check_evaluator.py --samples 1000000
+    python check_evaluator.py --exhaustive --workers 8   # все 133 784 560 рук
+    python check_evaluator.py --batch                    # numpy против таблиц
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import evaluator
+from evaluator import (ROYAL_FLUSH, STRAIGHT_FLUSH, FOUR_OF_A_KIND, FULL_HOUSE, FLUSH,
+                       STRAIGHT, THREE_OF_A_KIND, TWO_PAIR, PAIR, HIGH_CARD)
+
+
+def _find_straight(values):
+    unique_values = sorted(set(values), reverse=True)
+
+    for i in range(len(unique_values) - 4):
+        if unique_values[i] - unique_values[i + 4] == 4:
+            return unique_values[i:i + 5]
+
+    # Исправлено: колесо A-5 проверяется после старших стритов,
+    # иначе при A-2-3-4-5-6 стрит до шестёрки оценивался как колесо
+    if set([14, 2, 3, 4, 5]).issubset(set(values)):
+        return [5, 4, 3, 2, 14]
+    return None
+
+
+def reference_evaluate(codes):
+    """Прежний алгоритм evaluate_hand над кодами карт"""
+    cards = sorted(((code % 13 + 2, code // 13) for code in codes), reverse=True)
+    if len(cards) < 5:
+        return (HIGH_CARD, [value for value, _ in cards[:5]])
+
+    values = [value for value, _ in cards]
+    suits = [suit for _, suit in cards]
+
+    suit_counts = Counter(suits)
+    flush_suit = None
+    for suit, count in suit_counts.items():
+        if count >= 5:
+            flush_suit = suit
+            break
+
+    value_counts = Counter(values)
+    sorted_values = sorted(values, reverse=True)
+
+    straight_cards = _find_straight(values)
+
+    pairs = []
+    trips = []
+    four_of_a_kind = None
+
+    for value, count in value_counts.items():
+        if count == 2:
+            pairs.append(value)
+        elif count == 3:
+            trips.append(value)
+        elif count == 4:
+            four_of_a_kind = value
+
+    pairs.sort(reverse=True)
+    # Исправлено: две тройки дают фулл-хаус (младшая тройка - пара)
+    trips.sort(reverse=True)
+    three_of_a_kind = trips[0] if trips else None
+    pairs = sorted(pairs + trips[1:], reverse=True)
+
+    if flush_suit is not None and straight_cards:
+        flush_values = [value for value, suit in cards if suit == flush_suit]
+        straight_flush = _find_straight(flush_values)
+        if straight_flush:
+            # Исправлено: стрит-флеш до пятёрки (колесо) не роял-флеш
+            if straight_flush[0] == 14:
+                return (ROYAL_FLUSH, straight_flush)
+            return (STRAIGHT_FLUSH, straight_flush)
+
+    if four_of_a_kind:
+        kicker = max([v for v in values if v != four_of_a_kind])
+        return (FOUR_OF_A_KIND, [four_of_a_kind] * 4 + [kicker])
+
+    if three_of_a_kind and pairs:
+        return (FULL_HOUSE, [three_of_a_kind] * 3 + [max(pairs)] * 2)
+
+    if flush_suit is not None:
+        flush_values = [value for value, suit in cards if suit == flush_suit]
+        return (FLUSH, sorted(flush_values[:5], reverse=True))
+
+    if straight_cards:
+        return (STRAIGHT, straight_cards)
+
+    if three_of_a_kind:
+        kickers = sorted([v for v in values if v != three_of_a_kind], reverse=True)[:2]
+        return (THREE_OF_A_KIND, [three_of_a_kind] * 3 + kickers)
+
+    if len(pairs) >= 2:
+        top_pairs = sorted(pairs, reverse=True)[:2]
+        kicker = max([v for v in values if v not in top_pairs])
+        return (TWO_PAIR, top_pairs * 2 + [kicker])
+
+    if len(pairs) == 1:
+        kickers = sorted([v for v in values if v != pairs[0]], reverse=True)[:3]
+        return (PAIR, [pairs[0]] * 2 + kickers)
+
+    return (HIGH_CARD, sorted_values[:5])
+
+
+def check_hand(codes):
+    """Совпадает ли оценка руки с прежним алгоритмом"""
+    strength = evaluator.evaluate(codes)
+    return (evaluator.category(strength), evaluator.values(strength)) == reference_evaluate(codes)
+
+
+def _check_first_card(first):
+    """Проверить все 7-карточные руки с младшей картой first"""
+    checked = 0
+    mismatches = []
+    for rest in combinations(range(first + 1, 52), 6):
+        codes = (first,) + rest
+        checked += 1
+        if not check_hand(codes):
+            mismatches.append(codes)
+    return checked, mismatches
+
+
+def check_sample(samples, seed=None, sizes=(5, 6, 7)):
+    """Проверить случайную выборку рук, вернуть (число рук, расхождения)"""
+    rng = random.Random(seed)
+    deck = list(range(52))
+    mismatches = []
+    for _ in range(samples):
+        codes = rng.sample(deck, rng.choice(sizes))
+        if not check_hand(codes):
+            mismatches.append(codes)
+    return samples, mismatches
+
+
+def check_batch(samples, seed=None):
+    """Сверить векторный оценщик с табличным на случайных 7-карточных руках"""
+    import numpy as np
+    from batch_evaluator import evaluate_batch
+
+    rng = np.random.default_rng(seed)
+    codes = rng.random((samples, 52)).argsort(axis=1)[:, :7]
+    strengths, _ = evaluate_batch(codes)
+    mismatches = [row for row, strength in zip(codes.tolist(), strengths.tolist())
+                  if evaluator.evaluate(row) != strength]
+    return samples, mismatches
+
+
+def check_exhaustive(workers=None):
+    """Проверить все 7-карточные руки, распределив их по процессам"""
+    checked = 0
+    mismatches = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for count, bad in pool.map(_check_first_card, range(46)):
+            checked += count
+            mismatches.extend(bad)
+    return checked, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сверка табличного оценщика рук")
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--exhaustive", action="store_true",
+                        help="перебрать все 133 784 560 рук из 7 карт")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch", action="store_true",
+                        help="сверить векторный оценщик (numpy) с табличным")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.exhaustive:
+        checked, mismatches = check_exhaustive(args.workers)
+    elif args.batch:
+        checked, mismatches = check_batch(args.samples, args.seed)
+    else:
+        checked, mismatches = check_sample(args.samples, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"Проверено рук: {checked} за {elapsed:.1f} с, расхождений: {len(mismatches)}")
+    for codes in mismatches[:10]:
+        print(codes, evaluator.evaluate(codes), reference_evaluate(codes))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
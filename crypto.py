@@ -0,0 +1,258 @@
+"""Криптографические профили дилера и игроков.
+
+Профиль (провайдер) отвечает за ключи, подпись и запечатывание данных
+для получателя:
+
+    rsa - RSA-2048: подпись RSA-PSS, шифрование RSA-OAEP (SHA-256);
+    ec  - Ed25519 для подписи и X25519 для шифрования: эфемерный обмен
+          ключами X25519, HKDF-SHA256 и AES-256-GCM.
+
+Профиль выбирается для стола: PokerGame(..., crypto="ec"). Встроенный
+замер задержек операций каждого профиля на текущей машине:
+
+    python crypto.py --iterations 200
+"""
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import time
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey, X25519PublicKey
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.exceptions import InvalidSignature
+
+from keypool import get_key_pool, KEY_SIZE
+from metrics import timed
+
+NONCE_SIZE = 12
+SESSION_KEY_BITS = 256
+
+
+class SessionCipher:
+    """Симметричный AEAD-шифр сеанса (AES-256-GCM): nonce + шифртекст"""
+
+    def __init__(self, key):
+        self._aesgcm = AESGCM(key)
+
+    @staticmethod
+    def generate_key():
+        return AESGCM.generate_key(bit_length=SESSION_KEY_BITS)
+
+    @timed("session_seal")
+    def seal(self, plaintext, associated_data=None):
+        return self._seal(plaintext, associated_data)
+
+    @timed("session_decrypt")
+    def open(self, sealed, associated_data=None):
+        """Расшифровать; при подмене выбрасывает cryptography.exceptions.InvalidTag"""
+        return self._open(sealed, associated_data)
+
+    # Без замера: используются внутри seal/open профиля ec, который замеряется сам
+    def _seal(self, plaintext, associated_data=None):
+        nonce = os.urandom(NONCE_SIZE)
+        return nonce + self._aesgcm.encrypt(nonce, plaintext, associated_data)
+
+    def _open(self, sealed, associated_data=None):
+        return self._aesgcm.decrypt(sealed[:NONCE_SIZE], sealed[NONCE_SIZE:], associated_data)
+
+
+class RSAProvider:
+    name = "rsa"
+
+    def __init__(self, use_pool=True):
+        self.use_pool = use_pool
+        self._oaep = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()),
+                                  algorithm=hashes.SHA256(),
+                                  label=None)
+        self._pss = padding.PSS(mgf=padding.MGF1(hashes.SHA256()),
+                                salt_length=padding.PSS.MAX_LENGTH)
+
+    @timed("keygen")
+    def generate_private_key(self):
+        if self.use_pool:
+            return get_key_pool().acquire()
+        return rsa.generate_private_key(public_exponent=65537, key_size=KEY_SIZE)
+
+    def public_key(self, private_key):
+        return private_key.public_key()
+
+    def fingerprint(self, public_key):
+        """SHA-256 от открытого ключа в DER (SubjectPublicKeyInfo)"""
+        der = public_key.public_bytes(serialization.Encoding.DER,
+                                      serialization.PublicFormat.SubjectPublicKeyInfo)
+        return hashlib.sha256(der).hexdigest()
+
+    @timed("sign")
+    def sign(self, private_key, data):
+        return private_key.sign(data, self._pss, hashes.SHA256())
+
+    @timed("verify")
+    def verify(self, public_key, signature, data):
+        try:
+            public_key.verify(signature, data, self._pss, hashes.SHA256())
+            return True
+        except InvalidSignature:
+            return False
+
+    @timed("seal")
+    def seal(self, public_key, plaintext):
+        return public_key.encrypt(plaintext, self._oaep)
+
+    @timed("decrypt")
+    def open(self, private_key, sealed):
+        return private_key.decrypt(sealed, self._oaep)
+
+
+class ECPrivateKey:
+    """Пара закрытых ключей участника: Ed25519 (подпись) и X25519 (обмен)"""
+
+    def __init__(self, signing, exchange):
+        self.signing = signing
+        self.exchange = exchange
+        self._public_key = None
+
+    def public_key(self):
+        if self._public_key is None:
+            self._public_key = ECPublicKey(self.signing.public_key(), self.exchange.public_key())
+        return self._public_key
+
+
+class ECPublicKey:
+    def __init__(self, signing, exchange):
+        self.signing = signing
+        self.exchange = exchange
+        # Байты ключа обмена входят в HKDF каждой запечатанной карты
+        self.exchange_bytes = _raw_public_bytes(exchange)
+
+
+def _raw_public_bytes(public_key):
+    return public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+
+
+class ECProvider:
+    name = "ec"
+    _EPHEMERAL_SIZE = 32
+    _HKDF_INFO = b"poker-ec-seal"
+
+    @timed("keygen")
+    def generate_private_key(self):
+        return ECPrivateKey(Ed25519PrivateKey.generate(), X25519PrivateKey.generate())
+
+    def public_key(self, private_key):
+        return private_key.public_key()
+
+    def fingerprint(self, public_key):
+        """SHA-256 от открытых ключей Ed25519 и X25519"""
+        return hashlib.sha256(_raw_public_bytes(public_key.signing) + public_key.exchange_bytes).hexdigest()
+
+    @timed("sign")
+    def sign(self, private_key, data):
+        return private_key.signing.sign(data)
+
+    @timed("verify")
+    def verify(self, public_key, signature, data):
+        try:
+            public_key.signing.verify(signature, data)
+            return True
+        except InvalidSignature:
+            return False
+
+    def _session_cipher(self, shared, ephemeral_bytes, recipient_bytes):
+        key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=SESSION_KEY_BITS // 8,
+            salt=None,
+            info=self._HKDF_INFO + ephemeral_bytes + recipient_bytes,
+        ).derive(shared)
+        return SessionCipher(key)
+
+    @timed("seal")
+    def seal(self, public_key, plaintext):
+        ephemeral = X25519PrivateKey.generate()
+        ephemeral_bytes = _raw_public_bytes(ephemeral.public_key())
+        shared = ephemeral.exchange(public_key.exchange)
+        cipher = self._session_cipher(shared, ephemeral_bytes, public_key.exchange_bytes)
+        return ephemeral_bytes + cipher._seal(plaintext)
+
+    @timed("decrypt")
+    def open(self, private_key, sealed):
+        ephemeral_bytes = sealed[:self._EPHEMERAL_SIZE]
+        shared = private_key.exchange.exchange(X25519PublicKey.from_public_bytes(ephemeral_bytes))
+        cipher = self._session_cipher(shared, ephemeral_bytes, private_key.public_key().exchange_bytes)
+        return cipher._open(sealed[self._EPHEMERAL_SIZE:])
+
+
+PROVIDERS = {
+    RSAProvider.name: RSAProvider,
+    ECProvider.name: ECProvider,
+}
+
+_providers = {}
+
+
+def get_provider(name):
+    """Провайдер профиля по имени ("rsa" или "ec")"""
+    if name not in PROVIDERS:
+        raise ValueError(f"Неизвестный криптографический профиль: {name}")
+    if name not in _providers:
+        _providers[name] = PROVIDERS[name]()
+    return _providers[name]
+
+
+def _measure(operation, iterations):
+    """Медиана и среднее времени операции, мс"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(samples), "mean_ms": statistics.fmean(samples)}
+
+
+def benchmark(names=None, iterations=100, keygen_iterations=5, payload_size=64):
+    """Задержки keygen, sign, verify, seal и open для каждого профиля"""
+    results = {}
+    data = os.urandom(payload_size)
+    for name in names or PROVIDERS:
+        provider = PROVIDERS[name]()
+        if isinstance(provider, RSAProvider):
+            # Замеряется сама генерация, а не выдача готового ключа из пула
+            provider.use_pool = False
+            keygen_runs = keygen_iterations
+        else:
+            keygen_runs = iterations
+
+        private_key = provider.generate_private_key()
+        public_key = provider.public_key(private_key)
+        signature = provider.sign(private_key, data)
+        sealed = provider.seal(public_key, data)
+
+        results[name] = {
+            "keygen": _measure(provider.generate_private_key, keygen_runs),
+            "sign": _measure(lambda: provider.sign(private_key, data), iterations),
+            "verify": _measure(lambda: provider.verify(public_key, signature, data), iterations),
+            "seal": _measure(lambda: provider.seal(public_key, data), iterations),
+            "open": _measure(lambda: provider.open(private_key, sealed), iterations),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер криптографических профилей")
+    parser.add_argument("--profiles", default=",".join(PROVIDERS))
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--keygen-iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    results = benchmark(args.profiles.split(","), args.iterations, args.keygen_iterations)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
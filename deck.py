@@ -1,14 +1,14 @@
 import random
+import copy
 from enum import Enum
 import hashlib
 import random
 import os
 import json
 import base64
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes
+from log import get_logger
+from metrics import timed
+from merkle import leaf_hash, build_levels, inclusion_proof
 
 
 class Suit(Enum):
@@ -36,13 +36,7 @@ class Rank(Enum):
     @property
     def value_int(self):
         """Числовое значение карты"""
-        values = {
-            Rank.TWO: 2, Rank.THREE: 3, Rank.FOUR: 4, Rank.FIVE: 5,
-            Rank.SIX: 6, Rank.SEVEN: 7, Rank.EIGHT: 8, Rank.NINE: 9,
-            Rank.TEN: 10, Rank.JACK: 11, Rank.QUEEN: 12,
-            Rank.KING: 13, Rank.ACE: 14
-        }
-        return values[self]
+        return RANK_VALUES[self]
 
     @property
     def symbol(self):
@@ -50,19 +44,65 @@ class Rank(Enum):
         return self.value
 
 
+# Порядковые номера рангов и мастей: код карты = масть * 13 + ранг
+RANK_INDEX = {rank: i for i, rank in enumerate(Rank)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(Suit)}
+RANK_VALUES = {rank: i + 2 for rank, i in RANK_INDEX.items()}
+_RANKS = tuple(Rank)
+_SUITS = tuple(Suit)
+
+DECK_SIZE = 52
+# Получатель записей о картах борда в пакетной сдаче
+BOARD_RECIPIENT = "board"
+
+
+def card_aad(recipient, index):
+    """Связанные данные AEAD: кому и какой по счёту в сеансе сдана карта.
+
+    Сеанс живёт всю игру за столом, а номер карты идёт сквозь раздачи и не
+    повторяется, поэтому карта из прошлой раздачи не вскроется повторно.
+    """
+    return f"{recipient}:{index}".encode()
+
+
+def card_code(rank, suit):
+    """Код карты 0-51"""
+    return SUIT_INDEX[suit] * 13 + RANK_INDEX[rank]
+
+
 class Card:
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
-        self.visible = False
-        self.x = 0
-        self.y = 0
-        self.id = 0
+    """Карта колоды.
+
+    Для каждого кода 0-51 существует ровно один объект Card (см. CARDS),
+    поэтому карты сравниваются по идентичности, а по сети и в оценщик рук
+    передаётся только код. Видимость и положение карты на экране хранит
+    интерфейс, а не сама карта.
+    """
+    __slots__ = ("code", "rank", "suit", "rank_bit", "suit_bit")
+
+    def __new__(cls, rank, suit):
+        return CARDS[card_code(rank, suit)]
+
+    @classmethod
+    def from_code(cls, code):
+        """Карта по её коду"""
+        return CARDS[code]
+
+    @classmethod
+    def _create(cls, code):
+        card = object.__new__(cls)
+        card.code = code
+        card.rank = _RANKS[code % 13]
+        card.suit = _SUITS[code // 13]
+        card.rank_bit = 1 << (code % 13)
+        card.suit_bit = 1 << (code // 13)
+        return card
+
+    def __reduce__(self):
+        return Card.from_code, (self.code,)
 
     def __str__(self):
-        if self.visible:
-            return f"{self.rank.value}{self.suit.value}"
-        return "XX"
+        return f"{self.rank.value}{self.suit.value}"
 
     def __repr__(self):
         return str(self)
@@ -70,7 +110,7 @@ class Card:
     @property
     def value(self):
         """Числовое значение карты"""
-        return self.rank.value_int
+        return self.code % 13 + 2
 
     def get_color(self):
         """Цвет карты (красный для червей и бубей)"""
@@ -79,98 +119,255 @@ class Card:
         return (0, 0, 0)
 
 
+CARDS = tuple(Card._create(code) for code in range(DECK_SIZE))
+
+logger = get_logger("deck")
+
+
+class PlayerKey:
+    """Запись реестра ключей дилера: открытый ключ игрока и его отпечаток"""
+    __slots__ = ("public_key", "fingerprint")
+
+    def __init__(self, public_key, fingerprint):
+        self.public_key = public_key
+        self.fingerprint = fingerprint
+
+
 class Dealer:
-    def __init__(self):
+    def __init__(self, secure=True, crypto="rsa"):
         self.cards = []
-        private_key, public_key = self.generate_key_pair()
+        self.secure = secure
+        self.crypto = None
+        self.private_key = None
+        self.public_key = None
 
-        self.private_key = private_key
-        self.public_key = public_key
+        if secure:
+            # Криптография загружается только для шифрованной сдачи
+            from crypto import get_provider
+            self.crypto = get_provider(crypto)
 
-        print(f"Приватный ключ дилера:", self.private_key)
-        print(f"Публичный ключ дилера:", self.public_key)
+            private_key, public_key = self.generate_key_pair()
 
-        self.players_public_keys = []
+            self.private_key = private_key
+            self.public_key = public_key
+
+        # Реестр открытых ключей: id игрока -> PlayerKey, по записи на игрока
+        self.player_keys = {}
+        # Сеансовые ключи гибридной сдачи:
+        # получатель -> [SessionCipher, число карт, открытый ключ получателя]
+        self.sessions = {}
+        # Запись последней пакетной сдачи для проверки после раздачи
+        self.last_deal = None
 
     def generate_key_pair(self):
-        print("Создаются ключи для дилера...")
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
+        logger.debug("Дилер создает ключи (%s)", self.crypto.name, extra={"profile": self.crypto.name})
+        private_key = self.crypto.generate_private_key()
 
-        public_key = private_key.public_key()
+        public_key = self.crypto.public_key(private_key)
 
         return private_key, public_key
 
-    def digital_sign(self, data):
-        return self.private_key.sign(
-            data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+    def register_key(self, player_id, public_key):
+        """Запомнить ключ игрока; True, если ключ новый или сменился"""
+        entry = self.player_keys.get(player_id)
+        if entry is not None and entry.public_key is public_key:
+            return False
 
-    def initial_shuffle(self):
-        self.cards = []
+        fingerprint = self.crypto.fingerprint(public_key)
+        if entry is not None and entry.fingerprint == fingerprint:
+            entry.public_key = public_key
+            return False
 
-        print("Дилер создает колоду...")
-        for suit in Suit:
-            for rank in Rank:
-                self.cards.append(Card(rank, suit))
+        self.player_keys[player_id] = PlayerKey(public_key, fingerprint)
+        return True
 
-        for i in range(len(self.cards)):
-            self.cards[i].id = str(i)
+    def forget_key(self, player_id):
+        """Удалить ключ игрока, который покинул стол"""
+        self.player_keys.pop(player_id, None)
+
+    def player_key(self, player_id):
+        return self.player_keys[player_id].public_key
+
+    def digital_sign(self, data):
+        return self.crypto.sign(self.private_key, data)
+
+    def initial_shuffle(self):
+        logger.debug("Дилер создает колоду")
+        self.cards = list(range(DECK_SIZE))
 
         self.shuffle()
 
+    @timed("shuffle")
     def shuffle(self):
         """Перемешать колоду"""
-        print("Дилер тасует колоду...")
+        logger.debug("Дилер тасует колоду")
         random.shuffle(self.cards)
 
     def get_card_for_player(self, player_public_key):
         """Взять карту из колоды"""
         if len(self.cards) > 0:
-            card = self.cards.pop()
-            card.visible = True
+            return self.encrypt_card(self.cards.pop(), player_public_key)
+
+        else:
+            logger.warning("Колода пуста")
+            return None
+
+    def take_card(self):
+        """Снять код верхней карты колоды (без шифрования)"""
+        if len(self.cards) > 0:
+            return self.cards.pop()
+        return None
 
-            R_1 = os.urandom(8).hex()
-            print('Дилер шифрует карту ', card.rank, card.suit)
+    def encrypt_card(self, code, player_public_key):
+        """Подписать и зашифровать уже снятую с колоды карту для игрока.
 
-            sign_data = R_1.encode() + card.id.encode()
-            print("Дилер подписывает карту")
-            signature = self.digital_sign(sign_data)
+        Не трогает колоду, поэтому карты разных игроков можно шифровать
+        параллельно, сохранив порядок сдачи (см. PokerGame._deal_cards).
+        """
+        card_id = str(code)
 
-            data = {
-                'card': card.id,
-                'salt': R_1,
-            }
+        R_1 = os.urandom(8).hex()
+        logger.debug("Дилер шифрует и подписывает карту %s", CARDS[code], extra={"card": code})
+
+        sign_data = R_1.encode() + card_id.encode()
+        signature = self.digital_sign(sign_data)
+
+        data = {
+            'card': card_id,
+            'salt': R_1,
+        }
+
+        byte_data = json.dumps(data).encode()
+
+        card_enc = self.crypto.seal(player_public_key, byte_data)
+
+        return card_enc, signature
+
+    def open_session(self, recipient, player_public_key):
+        """Создать сеансовый ключ AES-256-GCM для игрока на всю игру за столом.
+
+        Ключ шифруется открытым ключом игрока и подписывается дилером -
+        это единственные асимметричные операции гибридной сдачи; сами карты
+        во всех раздачах запечатываются сеансовым ключом (seal_card).
+        """
+        from crypto import SessionCipher
+
+        session_key = SessionCipher.generate_key()
+        self.sessions[recipient] = [SessionCipher(session_key), 0, player_public_key]
+
+        key_enc = self.crypto.seal(player_public_key, session_key)
+        signature = self.digital_sign(key_enc)
+
+        return key_enc, signature
 
-            byte_data = json.dumps(data).encode()
+    def has_session(self, recipient, player_public_key):
+        """Открыт ли уже сеанс для получателя с этим открытым ключом"""
+        session = self.sessions.get(recipient)
+        return session is not None and session[2] is player_public_key
 
-            card_enc = player_public_key.encrypt(
-                byte_data,
-                padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                             algorithm=hashes.SHA256(),
-                             label=None)
-            )
+    def seal_card(self, recipient):
+        """Взять карту из колоды и запечатать её сеансовым ключом игрока"""
+        if len(self.cards) > 0:
+            card_id = str(self.cards.pop())
+            session = self.sessions[recipient]
+            cipher, index, _ = session
+            session[1] += 1
+
+            logger.debug("Дилер запечатывает карту %s для %s", CARDS[int(card_id)], recipient,
+                         extra={"card": int(card_id), "recipient": recipient})
+
+            data = {
+                'card': card_id,
+                'salt': os.urandom(8).hex(),
+            }
 
-            return card_enc, signature
+            return cipher.seal(json.dumps(data).encode(), card_aad(recipient, index))
 
         else:
-            print("Deck is empty")
+            logger.warning("Колода пуста")
             return None
 
+    def deal_batch(self, recipients, cards_each=2, board_cards=5, map_func=map):
+        """Сдать карманные карты всем игрокам с одной подписью на раздачу.
+
+        recipients - список (получатель, открытый ключ) в порядке сдачи.
+        Дилер записывает каждую карту как (соль, карта, получатель), а также
+        следующие board_cards карт колоды, которые выйдут на борд, строит
+        над записями дерево Меркла и подписывает его корень. Возвращает
+        (корень, подпись, пакеты), где пакет - (получатель, зашифрованная
+        карта, доказательство включения). map_func позволяет шифровать
+        карты параллельно (например, executor.map).
+        """
+        logger.debug("Дилер готовит пакетную сдачу")
+        entries = []
+        for _ in range(cards_each):
+            for recipient, _ in recipients:
+                entries.append({
+                    'recipient': recipient,
+                    'card': str(self.cards.pop()),
+                    'salt': os.urandom(8).hex(),
+                })
+
+        # draw() берёт карты с конца колоды
+        for card in self.cards[:-board_cards - 1:-1]:
+            entries.append({
+                'recipient': BOARD_RECIPIENT,
+                'card': str(card),
+                'salt': os.urandom(8).hex(),
+            })
+
+        levels = build_levels([leaf_hash(e['salt'], e['card'], e['recipient']) for e in entries])
+        root = levels[-1][0]
+        logger.debug("Дилер подписывает корень дерева сдачи %s", root.hex(), extra={"root": root.hex()})
+        signature = self.digital_sign(root)
+
+        self.last_deal = {
+            'root': root.hex(),
+            'signature': signature.hex(),
+            'entries': entries,
+        }
+
+        public_keys = dict(recipients)
+
+        def make_packet(index):
+            entry = entries[index]
+            byte_data = json.dumps({'card': entry['card'], 'salt': entry['salt']}).encode()
+            card_enc = self.crypto.seal(public_keys[entry['recipient']], byte_data)
+            return entry['recipient'], card_enc, inclusion_proof(levels, index)
+
+        hole_indexes = [i for i, entry in enumerate(entries) if entry['recipient'] != BOARD_RECIPIENT]
+        packets = list(map_func(make_packet, hole_indexes))
+
+        return root, signature, packets
+
+    def deal_record(self):
+        """Полная запись последней пакетной сдачи (корень, подпись, все записи)"""
+        return self.last_deal
+
+    def fork(self):
+        """Копия дилера с теми же ключами, но своей колодой и сеансами.
+
+        На копии заранее готовится следующая раздача, не мешая текущей;
+        готовое состояние переносится обратно через adopt.
+        """
+        dealer = copy.copy(self)
+        dealer.cards = []
+        # Сеансы продолжаются на копии; счётчики копируются, чтобы отброшенная
+        # подготовка не сдвинула номера карт
+        dealer.sessions = {name: list(session) for name, session in self.sessions.items()}
+        dealer.last_deal = None
+        return dealer
+
+    def adopt(self, dealer):
+        """Принять колоду, сеансы и запись сдачи, подготовленные на копии"""
+        self.cards = dealer.cards
+        self.sessions = dealer.sessions
+        self.last_deal = dealer.last_deal
+
     def draw(self):
         """Взять карту из колоды"""
         if len(self.cards) > 0:
-            card = self.cards.pop()
-            card.visible = True
-            return card
+            return CARDS[self.cards.pop()]
         return None
 
     def __len__(self):
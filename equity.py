@@ -0,0 +1,436 @@
+"""Расчёт эквити (вероятностей выигрыша) рук.
+
+Недостающие карты борда и неизвестные карманные карты разыгрываются
+случайно блоками; блоки оцениваются векторно (batch_evaluator) и
+распределяются по процессам, у каждого блока свой независимый поток
+случайных чисел (numpy SeedSequence.spawn). Если всех вариантов раздачи
+не больше бюджета выборки (хедз-ап на тёрне и ривере, флоп), они
+перебираются полностью и эквити получается точным.
+
+Эквити классов стартовых рук (169 x 169) считается один раз командой
+
+    python equity.py build-preflop --samples 20000
+
+и хранится в бинарном файле, который при первом запросе отображается
+в память (numpy.memmap).
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import chain, combinations
+from math import comb
+
+import numpy as np
+
+from batch_evaluator import evaluate_batch
+from deck import DECK_SIZE
+
+# Доля банка при дележе на k игроков хранится в целых единицах:
+# 2520 делится на любое число игроков от 1 до 10
+SHARE_UNITS = 2520
+CHUNK_SAMPLES = 20000
+# Полный перебор длиннее этого числа раздач не выполняется
+MAX_EXACT_RUNOUTS = 2000000
+EXACT_CHUNK = 1 << 17
+
+PREFLOP_CLASSES = 169
+PREFLOP_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preflop_equity.bin")
+_PREFLOP_DTYPE = "<f4"
+_RANK_SYMBOLS = "23456789TJQKA"
+
+
+class Equity:
+    """Эквити одной руки"""
+
+    def __init__(self, win, tie, equity, stderr):
+        self.win = win
+        self.tie = tie
+        self.equity = equity
+        self.stderr = stderr
+
+    def __repr__(self):
+        return (f"Equity(win={self.win:.4f}, tie={self.tie:.4f}, "
+                f"equity={self.equity:.4f} ± {self.stderr:.4f})")
+
+
+class EquityResult:
+    """Эквити всех рук и объём выборки, на котором оно посчитано"""
+
+    def __init__(self, hands, samples, elapsed):
+        self.hands = hands
+        self.samples = samples
+        self.elapsed = elapsed
+
+    @property
+    def max_stderr(self):
+        return max(hand.stderr for hand in self.hands)
+
+    def __repr__(self):
+        return f"EquityResult({self.hands}, samples={self.samples}, elapsed={self.elapsed:.2f}s)"
+
+
+def to_codes(cards):
+    """Коды карт из объектов Card или целых чисел"""
+    return [card if isinstance(card, int) else card.code for card in cards]
+
+
+def _prepare(hands, community_cards, dead_cards):
+    hands = [None if hand is None else to_codes(hand) for hand in hands]
+    board = to_codes(community_cards)
+    dead = to_codes(dead_cards)
+
+    if len(hands) < 2:
+        raise ValueError("Для расчёта эквити нужно хотя бы две руки")
+    if any(hand is not None and len(hand) != 2 for hand in hands):
+        raise ValueError("Рука должна состоять из двух карт или быть неизвестной (None)")
+    if len(board) > 5:
+        raise ValueError("На борде не может быть больше пяти карт")
+
+    known = [code for hand in hands if hand for code in hand] + board + dead
+    if len(set(known)) != len(known):
+        raise ValueError("Одна и та же карта указана несколько раз")
+    if 2 * hands.count(None) + 5 - len(board) > DECK_SIZE - len(known):
+        raise ValueError("В колоде не хватает карт для раздачи")
+
+    return hands, board, known
+
+
+def _showdown_totals(hands, board, draws):
+    """Итоги вскрытий: массивы (кол-во рук, число раздач) карт -> суммы"""
+    samples = len(draws)
+    board_cards = np.empty((samples, 5), dtype=np.int16)
+    board_cards[:, :len(board)] = board
+    board_cards[:, len(board):] = draws[:, :5 - len(board)]
+    position = 5 - len(board)
+
+    strengths = np.empty((len(hands), samples), dtype=np.int32)
+    cards = np.empty((samples, 7), dtype=np.int16)
+    cards[:, 2:] = board_cards
+    for i, hand in enumerate(hands):
+        if hand is None:
+            cards[:, :2] = draws[:, position:position + 2]
+            position += 2
+        else:
+            cards[:, :2] = hand
+        strengths[i], _ = evaluate_batch(cards)
+
+    winners = strengths == strengths.max(axis=0)
+    winner_count = winners.sum(axis=0)
+    units = np.where(winners, SHARE_UNITS // winner_count, 0).astype(np.int64)
+
+    return (
+        (winners & (winner_count == 1)).sum(axis=1),
+        (winners & (winner_count > 1)).sum(axis=1),
+        units.sum(axis=1),
+        (units * units).sum(axis=1),
+    )
+
+
+def _simulate_chunk(hands, board, known, samples, seed):
+    """Разыграть samples случайных раздач (выполняется в процессе пула)"""
+    rng = np.random.default_rng(seed)
+    remaining = np.setdiff1d(np.arange(DECK_SIZE, dtype=np.int16), known)
+    needed = 2 * hands.count(None) + 5 - len(board)
+
+    order = rng.random((samples, len(remaining))).argsort(axis=1)[:, :needed]
+    return (samples,) + _showdown_totals(hands, board, remaining[order])
+
+
+class _Totals:
+    """Накопленные суммы по всем обработанным блокам"""
+
+    def __init__(self, num_hands):
+        self.samples = 0
+        self.wins = np.zeros(num_hands, dtype=np.int64)
+        self.ties = np.zeros(num_hands, dtype=np.int64)
+        self.units = np.zeros(num_hands, dtype=np.int64)
+        self.units_sq = np.zeros(num_hands, dtype=np.int64)
+
+    def add(self, chunk):
+        samples, wins, ties, units, units_sq = chunk
+        self.samples += samples
+        self.wins += wins
+        self.ties += ties
+        self.units += units
+        self.units_sq += units_sq
+
+    def result(self, elapsed, exact=False):
+        n = self.samples
+        hands = []
+        for i in range(len(self.wins)):
+            mean = self.units[i] / SHARE_UNITS / n
+            mean_sq = self.units_sq[i] / SHARE_UNITS ** 2 / n
+            variance = max(mean_sq - mean * mean, 0.0) * n / max(n - 1, 1)
+            stderr = 0.0 if exact else (variance / n) ** 0.5
+            hands.append(Equity(self.wins[i] / n, self.ties[i] / n, mean, stderr))
+        return EquityResult(hands, n, elapsed)
+
+
+def _count_runouts(hands, board, known):
+    left = DECK_SIZE - len(known) - (5 - len(board))
+    total = comb(DECK_SIZE - len(known), 5 - len(board))
+    for _ in range(hands.count(None)):
+        total *= comb(left, 2)
+        left -= 2
+    return total
+
+
+def _combinations_array(cards, size):
+    count = comb(len(cards), size)
+    flat = np.fromiter(chain.from_iterable(combinations(cards, size)), dtype=np.int16,
+                       count=count * size)
+    return flat.reshape(count, size)
+
+
+def _all_runouts(hands, board, known):
+    """Все варианты недостающих карт в порядке: борд, неизвестные руки"""
+    remaining = [code for code in range(DECK_SIZE) if code not in set(known)]
+    draws = _combinations_array(remaining, 5 - len(board))
+
+    pairs = _combinations_array(remaining, 2)
+    for _ in range(hands.count(None)):
+        rows = np.repeat(draws, len(pairs), axis=0)
+        holes = np.tile(pairs, (len(draws), 1))
+        overlap = (rows[:, :, None] == holes[:, None, :]).any(axis=(1, 2))
+        draws = np.hstack([rows, holes])[~overlap]
+    return draws
+
+
+def _enumerate(hands, board, known):
+    start = time.perf_counter()
+    totals = _Totals(len(hands))
+    draws = _all_runouts(hands, board, known)
+    for first in range(0, len(draws), EXACT_CHUNK):
+        chunk = draws[first:first + EXACT_CHUNK]
+        totals.add((len(chunk),) + _showdown_totals(hands, board, chunk))
+    return totals.result(time.perf_counter() - start, exact=True)
+
+
+def enumerate_equity(hands, community_cards=(), dead_cards=(), max_runouts=MAX_EXACT_RUNOUTS):
+    """Точное эквити полным перебором всех вариантов недостающих карт.
+
+    Аргументы как у calculate_equity. Если вариантов больше max_runouts,
+    выбрасывается ValueError - в этом случае следует брать выборку.
+    """
+    hands, board, known = _prepare(hands, community_cards, dead_cards)
+    runouts = _count_runouts(hands, board, known)
+    if runouts > max_runouts:
+        raise ValueError(f"Слишком много вариантов раздачи для перебора: {runouts}")
+    return _enumerate(hands, board, known)
+
+
+def calculate_equity(hands, community_cards=(), dead_cards=(), samples=200000,
+                     time_budget=None, target_stderr=None, workers=None, seed=None,
+                     on_progress=None, executor=None):
+    """Эквити рук методом Монте-Карло.
+
+    hands - список рук (по две карты Card или кода) либо None для
+    неизвестной руки. Если всех вариантов раздачи не больше бюджета
+    samples, они перебираются полностью (stderr = 0). Иначе выборка
+    останавливается, когда исчерпан бюджет
+    раздач (samples, None - без ограничения) или времени (time_budget,
+    секунды), когда стандартная ошибка всех рук не превышает
+    target_stderr, либо когда on_progress(result) вернёт True. workers=1 считает в текущем
+    процессе; executor позволяет переиспользовать готовый пул.
+    """
+    if samples is None and time_budget is None and target_stderr is None:
+        raise ValueError("Нужно задать хотя бы один бюджет: samples, time_budget или target_stderr")
+    if samples is None:
+        samples = float("inf")
+
+    hands, board, known = _prepare(hands, community_cards, dead_cards)
+    if _count_runouts(hands, board, known) <= min(samples, MAX_EXACT_RUNOUTS):
+        return _enumerate(hands, board, known)
+
+    root_seed = np.random.SeedSequence(seed)
+    totals = _Totals(len(hands))
+    start = time.perf_counter()
+    submitted = 0
+
+    def should_stop():
+        if totals.samples >= samples:
+            return True
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            return True
+        if target_stderr is not None and totals.samples > 1:
+            if totals.result(0).max_stderr <= target_stderr:
+                return True
+        if on_progress is not None and totals.samples:
+            return bool(on_progress(totals.result(time.perf_counter() - start)))
+        return False
+
+    def next_chunk_size():
+        return min(CHUNK_SAMPLES, samples - submitted)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1 and executor is None:
+        while not should_stop():
+            size = next_chunk_size()
+            totals.add(_simulate_chunk(hands, board, known, size, root_seed.spawn(1)[0]))
+            submitted += size
+        return totals.result(time.perf_counter() - start)
+
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = set()
+        stopped = False
+        while True:
+            while not stopped and len(pending) < 2 * workers and submitted < samples:
+                size = next_chunk_size()
+                pending.add(pool.submit(_simulate_chunk, hands, board, known, size,
+                                        root_seed.spawn(1)[0]))
+                submitted += size
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                totals.add(future.result())
+            if not stopped and should_stop():
+                stopped = True
+                for future in pending:
+                    future.cancel()
+                pending = {future for future in pending if not future.cancelled()}
+    finally:
+        if executor is None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    return totals.result(time.perf_counter() - start)
+
+
+def preflop_class(cards):
+    """Номер класса стартовой руки 0-168 (клетка сетки 13 x 13).
+
+    Строки и столбцы идут от туза к двойке; на диагонали пары, выше неё
+    одномастные руки, ниже - разномастные.
+    """
+    first, second = to_codes(cards)
+    high, low = max(first % 13, second % 13), min(first % 13, second % 13)
+    if first // 13 == second // 13:
+        return (12 - high) * 13 + (12 - low)
+    return (12 - low) * 13 + (12 - high)
+
+
+def preflop_class_name(index):
+    """Название класса: 'AA', 'AKs', 'T9o'"""
+    row, col = divmod(index, 13)
+    if row == col:
+        return _RANK_SYMBOLS[12 - row] * 2
+    if row < col:
+        return _RANK_SYMBOLS[12 - row] + _RANK_SYMBOLS[12 - col] + "s"
+    return _RANK_SYMBOLS[12 - col] + _RANK_SYMBOLS[12 - row] + "o"
+
+
+def preflop_class_by_name(name):
+    """Номер класса по названию ('AA', 'AKs', 'T9o')"""
+    high, low = (12 - _RANK_SYMBOLS.index(symbol) for symbol in name[:2].upper())
+    if high == low:
+        return high * 13 + low
+    if high > low:
+        high, low = low, high
+    if name[2:].lower() == "s":
+        return high * 13 + low
+    return low * 13 + high
+
+
+def _class_combos(index):
+    """Все конкретные пары карт класса"""
+    row, col = divmod(index, 13)
+    if row == col:
+        rank = 12 - row
+        return [(s1 * 13 + rank, s2 * 13 + rank) for s1, s2 in combinations(range(4), 2)]
+    if row < col:
+        high, low = 12 - row, 12 - col
+        return [(s * 13 + high, s * 13 + low) for s in range(4)]
+    high, low = 12 - col, 12 - row
+    return [(s1 * 13 + high, s2 * 13 + low) for s1 in range(4) for s2 in range(4) if s1 != s2]
+
+
+def _preflop_cell(first, second, samples, rng):
+    """Эквити класса first против класса second по случайной выборке"""
+    matchups = np.array([a + b for a in _class_combos(first) for b in _class_combos(second)
+                         if not set(a) & set(b)], dtype=np.int16)
+    holes = matchups[rng.integers(len(matchups), size=samples)]
+
+    keys = rng.random((samples, DECK_SIZE))
+    np.put_along_axis(keys, holes.astype(np.intp), 2.0, axis=1)
+    board = keys.argpartition(5, axis=1)[:, :5].astype(np.int16)
+
+    first_strength, _ = evaluate_batch(np.hstack([holes[:, :2], board]))
+    second_strength, _ = evaluate_batch(np.hstack([holes[:, 2:], board]))
+    wins = np.count_nonzero(first_strength > second_strength)
+    ties = np.count_nonzero(first_strength == second_strength)
+    return (wins + ties / 2) / samples
+
+
+def _preflop_row(first, samples, seed):
+    """Эквити класса first против классов first+1 .. 168"""
+    rng = np.random.default_rng(seed)
+    return first, [_preflop_cell(first, second, samples, rng)
+                   for second in range(first + 1, PREFLOP_CLASSES)]
+
+
+def build_preflop_table(path=PREFLOP_TABLE_PATH, samples=20000, workers=None, seed=0):
+    """Посчитать таблицу эквити 169 x 169 и сохранить её в path"""
+    table = np.full((PREFLOP_CLASSES, PREFLOP_CLASSES), 0.5, dtype=_PREFLOP_DTYPE)
+    seeds = np.random.SeedSequence(seed).spawn(PREFLOP_CLASSES)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = pool.map(_preflop_row, range(PREFLOP_CLASSES),
+                        [samples] * PREFLOP_CLASSES, seeds)
+        for first, row in rows:
+            table[first, first + 1:] = row
+            table[first + 1:, first] = 1 - np.asarray(row)
+
+    tmp_path = path + ".tmp"
+    table.tofile(tmp_path)
+    os.replace(tmp_path, path)
+    return table
+
+
+_preflop_table = None
+
+
+def load_preflop_table(path=PREFLOP_TABLE_PATH):
+    """Таблица эквити классов, отображённая в память (загружается один раз)"""
+    global _preflop_table
+    if _preflop_table is None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Нет таблицы префлоп-эквити {path}; создайте её: python equity.py build-preflop")
+        _preflop_table = np.memmap(path, dtype=_PREFLOP_DTYPE, mode="r",
+                                   shape=(PREFLOP_CLASSES, PREFLOP_CLASSES))
+    return _preflop_table
+
+
+def preflop_equity(first, second):
+    """Эквити руки first против second при олл-ине до флопа.
+
+    Руки задаются парами карт или названиями классов ('AKs'); ответ - среднее
+    по всем конкретным сочетаниям мастей классов, а не точное значение для
+    заданных карт.
+    """
+    table = load_preflop_table()
+    first = preflop_class_by_name(first) if isinstance(first, str) else preflop_class(first)
+    second = preflop_class_by_name(second) if isinstance(second, str) else preflop_class(second)
+    return float(table[first, second])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Таблица префлоп-эквити классов рук")
+    parser.add_argument("command", choices=["build-preflop"])
+    parser.add_argument("--samples", type=int, default=20000,
+                        help="раздач на каждую пару классов")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=PREFLOP_TABLE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_preflop_table(args.output, args.samples, args.workers, args.seed)
+    print(f"Таблица сохранена в {args.output} за {time.perf_counter() - start:.0f} с")
+
+
+if __name__ == "__main__":
+    main()
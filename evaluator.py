@@ -0,0 +1,203 @@
+"""Табличная оценка покерных рук (от 5 до 7 карт).
+
+Карта кодируется целым числом 0-51: ``код = масть * 13 + ранг``, где ранг
+0-12 соответствует порядку ``Rank`` (двойка - туз), а масть 0-3 порядку
+``Suit``. Сила руки - одно целое число, которое можно сравнивать напрямую:
+
+    сила = категория << 20 | v0 << 16 | v1 << 12 | v2 << 8 | v3 << 4 | v4
+
+где категория совпадает с ``HandRank.value``, а v0..v4 - значения карт
+(2-14) в порядке значимости, как их возвращал ``PokerHand.evaluate_hand``.
+"""
+import marshal
+import os
+import sys
+from itertools import combinations_with_replacement, product
+
+HIGH_CARD = 1
+PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10
+
+CATEGORY_SHIFT = 20
+
+# Построение таблиц занимает сотни миллисекунд, поэтому готовые таблицы
+# сохраняются рядом с модулем (формат marshal зависит от версии Python)
+TABLES_VERSION = 1
+TABLES_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "evaluator_tables.bin")
+
+_WHEEL_MASK = 0b1000000001111  # A, 2, 3, 4, 5
+_POW5 = [5 ** r for r in range(13)]
+
+
+def _pack(category, values):
+    """Упаковать категорию и значения карт в одно целое"""
+    strength = category
+    for value in values[:5]:
+        strength = (strength << 4) | value
+    return strength << 4 * (5 - min(len(values), 5))
+
+
+def _straight(mask):
+    """Значения старшего стрита в битовой маске рангов или None"""
+    for high in range(12, 3, -1):
+        run = 0b11111 << (high - 4)
+        if mask & run == run:
+            return list(range(high + 2, high - 3, -1))
+    if mask & _WHEEL_MASK == _WHEEL_MASK:
+        return [5, 4, 3, 2, 14]
+    return None
+
+
+def _flush_strength(mask):
+    """Сила лучшей руки из карт одной масти, заданных битовой маской"""
+    straight = _straight(mask)
+    if straight:
+        if straight[0] == 14:
+            return _pack(ROYAL_FLUSH, straight)
+        return _pack(STRAIGHT_FLUSH, straight)
+
+    values = [r + 2 for r in range(12, -1, -1) if mask >> r & 1]
+    return _pack(FLUSH, values[:5])
+
+
+def _rank_strength(ranks):
+    """Сила лучшей руки без учёта флеша по рангам карт (по убыванию)"""
+    values = [r + 2 for r in ranks]
+    if len(values) < 5:
+        return _pack(HIGH_CARD, values)
+
+    groups = ([], [], [], [], [])
+    mask = 0
+    for rank in set(ranks):
+        mask |= 1 << rank
+    for value in sorted(set(values), reverse=True):
+        groups[values.count(value)].append(value)
+    pairs, trips, quads = groups[2], groups[3], groups[4]
+
+    if quads:
+        kicker = max(v for v in values if v != quads[0])
+        return _pack(FOUR_OF_A_KIND, [quads[0]] * 4 + [kicker])
+
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return _pack(FULL_HOUSE, [trips[0]] * 3 + [pair] * 2)
+
+    straight = _straight(mask)
+    if straight:
+        return _pack(STRAIGHT, straight)
+
+    if trips:
+        kickers = [v for v in values if v != trips[0]][:2]
+        return _pack(THREE_OF_A_KIND, [trips[0]] * 3 + kickers)
+
+    if len(pairs) >= 2:
+        top_pairs = pairs[:2]
+        kicker = max(v for v in values if v not in top_pairs)
+        return _pack(TWO_PAIR, top_pairs * 2 + [kicker])
+
+    if pairs:
+        kickers = [v for v in values if v != pairs[0]][:3]
+        return _pack(PAIR, [pairs[0]] * 2 + kickers)
+
+    return _pack(HIGH_CARD, values[:5])
+
+
+def _build_tables():
+    # Ключ набора рангов - сумма 5 ** ранг: количества (0-4) образуют
+    # число в пятеричной системе, поэтому ключ однозначен для набора.
+    rank_table = {}
+    for size in range(8):
+        for ranks in combinations_with_replacement(range(12, -1, -1), size):
+            if any(ranks[i] == ranks[i + 4] for i in range(size - 4)):
+                continue
+            rank_table[sum(map(_POW5.__getitem__, ranks))] = _rank_strength(ranks)
+
+    flush_table = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if bin(mask).count("1") >= 5:
+            flush_table[mask] = _flush_strength(mask)
+
+    # Счётчики мастей хранятся по 4 бита на масть; для каждой комбинации
+    # счётчиков запоминаем сдвиг битовой маски флешевой масти или -1.
+    flush_shift = [-1] * (1 << 16)
+    for suit in range(4):
+        for flush_count in range(5, 8):
+            for others in product(range(8 - flush_count), repeat=3):
+                if sum(others) <= 7 - flush_count:
+                    counts = list(others)
+                    counts.insert(suit, flush_count)
+                    suits = sum(n << (4 * s) for s, n in enumerate(counts))
+                    flush_shift[suits] = 16 * suit
+
+    return rank_table, flush_table, flush_shift
+
+
+def _load_tables(path=TABLES_CACHE):
+    """Таблицы из кэша; если кэша нет или он устарел - построить и сохранить"""
+    key = (TABLES_VERSION, tuple(sys.version_info[:2]))
+    try:
+        with open(path, "rb") as f:
+            cached_key, tables = marshal.loads(f.read())
+        if cached_key == key and len(tables) == 3:
+            return tables
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    tables = _build_tables()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            marshal.dump((key, tables), f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Каталог только для чтения - таблицы просто строятся при каждом запуске
+        pass
+    return tables
+
+
+RANK_TABLE, FLUSH_TABLE, _FLUSH_SHIFT = _load_tables()
+
+# Для каждой карты одно слагаемое, в котором упакованы: бит карты в маске
+# её масти (биты 0-63), счётчик масти (биты 64-79) и ключ ранга (с 80 бита).
+# Сумма таких слагаемых по руке даёт все три величины сразу.
+_RANK_KEY_SHIFT = 80
+_SUITS_SHIFT = 64
+_CARD_TERMS = [
+    (5 ** (code % 13) << _RANK_KEY_SHIFT)
+    | (1 << (_SUITS_SHIFT + 4 * (code // 13)))
+    | (1 << (16 * (code // 13) + code % 13))
+    for code in range(52)
+]
+
+
+def evaluate(codes):
+    """Сила руки по кодам карт (от 0 до 7 карт)"""
+    acc = 0
+    for code in codes:
+        acc += _CARD_TERMS[code]
+
+    shift = _FLUSH_SHIFT[(acc >> _SUITS_SHIFT) & 0xFFFF]
+    if shift >= 0:
+        return FLUSH_TABLE[(acc >> shift) & 0x1FFF]
+    return RANK_TABLE[acc >> _RANK_KEY_SHIFT]
+
+
+def category(strength):
+    """Категория руки (значение HandRank)"""
+    return strength >> CATEGORY_SHIFT
+
+
+def values(strength):
+    """Значения карт руки в порядке значимости"""
+    result = [(strength >> shift) & 0xF for shift in (16, 12, 8, 4, 0)]
+    while result and result[-1] == 0:
+        result.pop()
+    return result
+
@@ -1,7 +1,16 @@
+import os
+import time
 from enum import Enum
-from collections import Counter
-from deck import Dealer, Card, Suit, Rank
+from concurrent.futures import ThreadPoolExecutor
+from deck import Dealer, Card, Suit, Rank, BOARD_RECIPIENT
 from player import Player
+from evaluator import evaluate, category, values
+from merkle import verify_deal_record
+from pots import PotLedger
+from log import get_logger
+from metrics import get_metrics, enable as enable_metrics, timed, METRICS
+
+logger = get_logger("game")
 
 
 class HandRank(Enum):
@@ -19,171 +28,161 @@ class HandRank(Enum):
 
 class PokerHand:
     def __init__(self, cards):
-        self.cards = sorted(cards, key=lambda x: x.rank.value_int, reverse=True)
-        self.rank = self.evaluate_hand()
+        self.cards = list(cards)
+        if METRICS.enabled:
+            start = time.perf_counter_ns()
+            self.strength = evaluate(card.code for card in self.cards)
+            METRICS.observe("evaluate", time.perf_counter_ns() - start)
+        else:
+            self.strength = evaluate(card.code for card in self.cards)
+
+    @property
+    def rank(self):
+        """Категория руки и значения карт в порядке значимости"""
+        return self.evaluate_hand()
 
     def evaluate_hand(self):
         """Оценить силу руки"""
-        if len(self.cards) < 5:
-            return (HandRank.HIGH_CARD, [card.rank.value_int for card in self.cards[:5]])
-
-        values = [card.rank.value_int for card in self.cards]
-        suits = [card.suit for card in self.cards]
-
-        suit_counts = Counter(suits)
-        flush_suit = None
-        for suit, count in suit_counts.items():
-            if count >= 5:
-                flush_suit = suit
-                break
-
-        value_counts = Counter(values)
-        sorted_values = sorted(values, reverse=True)
-
-        straight_cards = self._find_straight(values)
-
-        pairs = []
-        three_of_a_kind = None
-        four_of_a_kind = None
-
-        for value, count in value_counts.items():
-            if count == 2:
-                pairs.append(value)
-            elif count == 3:
-                three_of_a_kind = value
-            elif count == 4:
-                four_of_a_kind = value
-
-        pairs.sort(reverse=True)
-
-        # Проверка комбинаций
-        if flush_suit and straight_cards:
-            flush_cards = [card for card in self.cards if card.suit == flush_suit]
-            flush_values = [card.rank.value_int for card in flush_cards]
-            straight_flush = self._find_straight(flush_values)
-            if straight_flush:
-                if max(straight_flush) == 14:
-                    return (HandRank.ROYAL_FLUSH, straight_flush)
-                return (HandRank.STRAIGHT_FLUSH, straight_flush)
-
-        if four_of_a_kind:
-            kicker = max([v for v in values if v != four_of_a_kind])
-            return (HandRank.FOUR_OF_A_KIND, [four_of_a_kind] * 4 + [kicker])
-
-        if three_of_a_kind and pairs:
-            return (HandRank.FULL_HOUSE, [three_of_a_kind] * 3 + [max(pairs)] * 2)
-
-        if flush_suit:
-            flush_values = [card.rank.value_int for card in self.cards if card.suit == flush_suit]
-            return (HandRank.FLUSH, sorted(flush_values[:5], reverse=True))
-
-        if straight_cards:
-            return (HandRank.STRAIGHT, straight_cards)
-
-        if three_of_a_kind:
-            kickers = sorted([v for v in values if v != three_of_a_kind], reverse=True)[:2]
-            return (HandRank.THREE_OF_A_KIND, [three_of_a_kind] * 3 + kickers)
-
-        if len(pairs) >= 2:
-            top_pairs = sorted(pairs, reverse=True)[:2]
-            kicker = max([v for v in values if v not in top_pairs])
-            return (HandRank.TWO_PAIR, top_pairs * 2 + [kicker])
-
-        if len(pairs) == 1:
-            kickers = sorted([v for v in values if v != pairs[0]], reverse=True)[:3]
-            return (HandRank.PAIR, [pairs[0]] * 2 + kickers)
-
-        return (HandRank.HIGH_CARD, sorted_values[:5])
-
-    def _find_straight(self, values):
-        unique_values = sorted(set(values), reverse=True)
-
-        if set([14, 2, 3, 4, 5]).issubset(set(values)):
-            return [5, 4, 3, 2, 14]
-
-        for i in range(len(unique_values) - 4):
-            if unique_values[i] - unique_values[i + 4] == 4:
-                return unique_values[i:i + 5]
-        return None
+        return (HandRank(category(self.strength)), values(self.strength))
 
-    def compare(self, other_hand):
-        rank1, cards1 = self.rank
-        rank2, cards2 = other_hand.rank
+    @staticmethod
+    def evaluate_batch(codes):
+        """Оценить сразу много рук: массив кодов (N, 7) -> (силы, категории)"""
+        from batch_evaluator import evaluate_batch
+        return evaluate_batch(codes)
 
-        if rank1.value > rank2.value:
+    def compare(self, other_hand):
+        if self.strength > other_hand.strength:
             return 1
-        elif rank1.value < rank2.value:
+        elif self.strength < other_hand.strength:
             return -1
-        else:
-            for c1, c2 in zip(cards1, cards2):
-                if c1 > c2:
-                    return 1
-                elif c1 < c2:
-                    return -1
-            return 0
+        return 0
+
+
+DEALING_MODES = ("per_card", "hybrid", "batch")
+# Имена профилей crypto.PROVIDERS (сам crypto.py загружается только при шифрованной сдаче)
+CRYPTO_PROFILES = ("rsa", "ec")
+# Размеры стола, которые поддерживают движок и раскладка мест в интерфейсе
+MIN_PLAYERS = 2
+MAX_PLAYERS = 10
 
 
 class PokerGame:
-    def __init__(self, num_players):
+    def __init__(self, num_players, secure=True, dealing="per_card", crypto="rsa",
+                 deal_workers=None, predeal=True, instrument=False):
+        """secure=False - сдача без шифрования (для симуляций и тестов).
+
+        dealing - способ шифрованной сдачи: "per_card" (каждая карта
+        шифруется и подписывается отдельно), "hybrid" (один сеансовый ключ
+        на игрока за столом, карты запечатываются AES-GCM) или "batch"
+        (подпись одна на раздачу - корень дерева Меркла всей сдачи).
+
+        crypto - криптографический профиль стола: "rsa" (RSA-OAEP/PSS) или
+        "ec" (Ed25519 и X25519), см. crypto.py.
+
+        deal_workers - число потоков для шифрования и расшифровки карт при
+        сдаче (None - по числу игроков, но не больше числа ядер; 0 или 1 -
+        последовательно). Криптографические операции отпускают GIL, поэтому
+        карты разных игроков обрабатываются одновременно.
+
+        predeal - готовить следующую раздачу (перетасованную колоду,
+        зашифрованные и подписанные карты) в фоновом потоке, пока идёт
+        текущая, чтобы start_new_hand только раздавал готовое.
+
+        instrument - включить сбор метрик (см. metrics.py и метод metrics).
+        """
+        if not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+            raise ValueError(f"За столом может быть от {MIN_PLAYERS} до {MAX_PLAYERS} игроков: {num_players}")
+        if dealing not in DEALING_MODES:
+            raise ValueError(f"Неизвестный способ сдачи: {dealing}")
+        if crypto not in CRYPTO_PROFILES:
+            raise ValueError(f"Неизвестный криптографический профиль: {crypto}")
+        if instrument:
+            enable_metrics()
+
         self.players = []
-        self.dealer = Dealer()
+        self.secure = secure
+        self.dealing = dealing
+        self.crypto = crypto
+        self.dealer = Dealer(secure, crypto)
+        if deal_workers is None:
+            deal_workers = min(num_players, os.cpu_count() or 1)
+        self._deal_pool = None
+        if secure and deal_workers > 1:
+            self._deal_pool = ThreadPoolExecutor(max_workers=deal_workers,
+                                                 thread_name_prefix="deal")
+        self._predeal_executor = None
+        self._next_deal = None
+        if secure and predeal:
+            self._predeal_executor = ThreadPoolExecutor(max_workers=1,
+                                                        thread_name_prefix="predeal")
         self.community_cards = []
         self.pot = 0
+        self.pots = PotLedger()
+        self.payouts = {}
+        self.refunds = {}
         self.current_bet = 0
         self.dealer_position = 0
         self.small_blind = 10
         self.big_blind = 20
         self.game_phase = "preflop"
-        self.active_players = []
         self.current_player_index = 0
         self.num_players = num_players
         self.round_start_index = 0
-        self.players_acted_in_round = set()
+        # Места игроков как биты (бит i - self.players[i]), чтобы передача хода
+        # и проверка конца круга не искали игроков по спискам:
+        # in_hand_mask - не сбросившие карты, in_hand_count - их число,
+        # acted_mask - ходившие в этом круге торгов,
+        # owing_mask - ходившие, но ещё не уравнявшие текущую ставку
+        self.in_hand_mask = (1 << num_players) - 1
+        self.in_hand_count = num_players
+        self.acted_mask = 0
+        self.owing_mask = 0
 
         for i in range(num_players):
             name = f"Игрок {i + 1}"
-            player = Player(name, i)
+            player = Player(name, i, secure=secure, crypto=crypto)
             self.players.append(player)
-            self.active_players.append(player)
+
+    @property
+    def active_players(self):
+        """Игроки, которые остались в раздаче, в порядке мест"""
+        mask = self.in_hand_mask
+        return [p for p in self.players if mask >> p.position & 1]
+
+    def in_hand(self, player):
+        """Остался ли игрок в раздаче (не сбросил карты)"""
+        return bool(self.in_hand_mask >> player.position & 1)
 
     def start_new_hand(self):
         self.community_cards = []
         self.pot = 0
         self.current_bet = 0
         self.game_phase = "preflop"
-        self.players_acted_in_round = set()
-
-        print("Дилер получает публичные ключи игроков...")
-        for player in self.players:
-            self.dealer.players_public_keys.append((player.public_key, player))
-
-        print("Полученные публичные ключи:")
-        print(self.dealer.players_public_keys)
+        self.acted_mask = 0
+        self.owing_mask = 0
+        get_metrics().incr("hands")
 
-        print("Игроки получают публичный ключ дилера...")
-        for player in self.players:
-            player.dealer_public_key = self.dealer.public_key
-            print(f"{player.name} получил от сервера ключ", player.dealer_public_key)
-
-        self.dealer.initial_shuffle()
+        if self.secure:
+            self._exchange_keys()
 
         for player in self.players:
             player.reset_hand()
+        seated = [p for p in self.players if p.is_active]
+        self.in_hand_mask = sum(1 << p.position for p in seated)
+        self.in_hand_count = len(seated)
+        self.pots = PotLedger(seated)
+        self.payouts = {}
+        self.refunds = {}
 
-        for _ in range(2):
-            for player in self.players:
-                if player.is_active:
-                    card_enc, signature = self.dealer.get_card_for_player(player.public_key)
-
-                    player.decrypt_card(card_enc, signature)
+        self._deal_cards()
 
         self._post_blinds()
 
-        self.active_players = [p for p in self.players if p.is_active]
-        self.round_start_index = (self.dealer_position + 3) % len(self.players)
+        self.round_start_index = self._next_seat(self._next_seat(self._next_seat(self.dealer_position)))
         self.current_player_index = self.round_start_index
 
-        if self.active_players:
+        if self.in_hand_mask:
             current_player = self.players[self.current_player_index]
             while current_player.folded or not current_player.is_active:
                 self.current_player_index = (self.current_player_index + 1) % len(self.players)
@@ -191,39 +190,238 @@ class PokerGame:
                 if self.current_player_index == self.round_start_index:
                     break
 
+    def _map(self, func, items):
+        """map по пулу сдачи (если он есть); результаты в порядке items"""
+        if self._deal_pool is None:
+            return list(map(func, items))
+        return list(self._deal_pool.map(func, items))
+
+    def _deal_cards(self):
+        """Сдать по две карты каждому игроку, по одной за круг"""
+        recipients = [p for p in self.players if p.is_active]
+
+        if not self.secure:
+            self.dealer.initial_shuffle()
+            for _ in range(2):
+                for player in recipients:
+                    player.add_card(self.dealer.draw())
+            return
+
+        keys = [(p.name, self.dealer.player_key(p.position)) for p in recipients]
+        bundle = None
+        if self._next_deal is not None:
+            get_metrics().incr("predeal_ready" if self._next_deal.done() else "predeal_waited")
+            bundle = self._next_deal.result()
+            self._next_deal = None
+            if not self._bundle_matches(bundle, keys):
+                logger.info("Подготовленная раздача не подходит, сдаём заново")
+                get_metrics().incr("predeal_discarded")
+                bundle = None
+        if bundle is None:
+            bundle = self._prepare_deal(self._shuffled_dealer(), keys)
+
+        self.dealer.adopt(bundle["dealer"])
+        self._deliver(bundle, recipients)
+
+        if self._predeal_executor is not None:
+            self._next_deal = self._predeal_executor.submit(self._prepare_deal,
+                                                            self._shuffled_dealer(), keys)
+
+    def _shuffled_dealer(self):
+        """Копия дилера с новой перетасованной колодой.
+
+        Тасовка идёт в вызывающем потоке, чтобы порядок обращений к random
+        не зависел от фонового потока.
+        """
+        dealer = self.dealer.fork()
+        dealer.initial_shuffle()
+        return dealer
+
+    @staticmethod
+    def _bundle_matches(bundle, keys):
+        """Раздача подготовлена для тех же игроков с теми же ключами"""
+        prepared = bundle["recipients"]
+        return len(prepared) == len(keys) and all(
+            name == other_name and key is other_key
+            for (name, key), (other_name, other_key) in zip(prepared, keys))
+
+    def _prepare_deal(self, dealer, keys):
+        """Часть сдачи на стороне дилера: зашифровать и подписать карты.
+
+        Карты снимаются с колоды строго в порядке сдачи, а шифрование идёт
+        параллельно. dealer - копия дилера (fork), поэтому подготовка может
+        идти в фоне во время текущей раздачи.
+        """
+        bundle = {"dealer": dealer, "recipients": keys, "cards": {name: [] for name, _ in keys}}
+
+        if self.dealing == "hybrid":
+            # Сеанс открывается при первой раздаче игрока за столом и заново -
+            # только если сменился его ключ
+            fresh = [key for key in keys if not dealer.has_session(*key)]
+            sessions = self._map(lambda key: dealer.open_session(*key), fresh)
+            bundle["sessions"] = {name: session for (name, _), session in zip(fresh, sessions)}
+            for _ in range(2):
+                for name, _ in keys:
+                    bundle["cards"][name].append(dealer.seal_card(name))
+
+        elif self.dealing == "batch":
+            root, signature, packets = dealer.deal_batch(keys, map_func=self._map)
+            bundle["root"] = root
+            bundle["signature"] = signature
+            for recipient, card_enc, path in packets:
+                bundle["cards"][recipient].append((card_enc, path))
+
+        else:
+            deals = [(name, key, dealer.take_card()) for _ in range(2) for name, key in keys]
+            packets = self._map(lambda deal: dealer.encrypt_card(deal[2], deal[1]), deals)
+            for (name, _, _), packet in zip(deals, packets):
+                bundle["cards"][name].append(packet)
+
+        return bundle
+
+    def _deliver(self, bundle, recipients):
+        """Часть сдачи на стороне игроков: каждый вскрывает свои карты по порядку"""
+        cards = bundle["cards"]
+
+        def receive(player):
+            if self.dealing == "hybrid":
+                if player.name in bundle["sessions"]:
+                    player.accept_session(*bundle["sessions"][player.name])
+                for sealed in cards[player.name]:
+                    player.open_card(sealed)
+            elif self.dealing == "batch":
+                for card_enc, path in cards[player.name]:
+                    player.receive_batch_card(card_enc, bundle["root"], bundle["signature"], path)
+            else:
+                for card_enc, signature in cards[player.name]:
+                    player.decrypt_card(card_enc, signature)
+
+        self._map(receive, recipients)
+
+    def close(self):
+        """Остановить потоки сдачи и фоновую подготовку раздачи"""
+        if self._predeal_executor is not None:
+            self._predeal_executor.shutdown(wait=True, cancel_futures=True)
+            self._predeal_executor = None
+            self._next_deal = None
+        if self._deal_pool is not None:
+            self._deal_pool.shutdown(wait=False)
+            self._deal_pool = None
+
+    def audit_deal(self):
+        """Проверить запись пакетной сдачи после раздачи.
+
+        Подпись корня должна сходиться с раскрытыми записями, а карты на
+        руках и на борде - совпадать с тем, что дилер зафиксировал до сдачи.
+        """
+        record = self.dealer.deal_record()
+        if record is None:
+            return False
+        if not verify_deal_record(record, self.players[0].verify_sign):
+            return False
+
+        dealt = {}
+        for entry in record['entries']:
+            dealt.setdefault(entry['recipient'], []).append(int(entry['card']))
+
+        for player in self.players:
+            if [card.code for card in player.hand] != dealt.get(player.name, []):
+                return False
+        board = dealt.get(BOARD_RECIPIENT, [])
+        return [card.code for card in self.community_cards] == board[:len(self.community_cards)]
+
+    def _exchange_keys(self):
+        """Передать ключи, которые появились или сменились с прошлой раздачи"""
+        changed = [p for p in self.players if self.dealer.register_key(p.position, p.public_key)]
+
+        for player in self.players:
+            if player.dealer_public_key is not self.dealer.public_key:
+                player.dealer_public_key = self.dealer.public_key
+
+        if changed:
+            logger.debug("Обмен ключами: дилер получил %d новых открытых ключей игроков",
+                         len(changed), extra={"players": [p.name for p in changed]})
+
+    def _next_seat(self, position):
+        """Место следующего за position игрока, который участвует в раздаче"""
+        for step in range(1, len(self.players) + 1):
+            index = (position + step) % len(self.players)
+            if self.players[index].is_active:
+                return index
+        return position
+
+    def rotate_button(self):
+        """Передать кнопку дилера следующему игроку, у которого остались фишки"""
+        for step in range(1, len(self.players) + 1):
+            index = (self.dealer_position + step) % len(self.players)
+            if self.players[index].chips > 0:
+                self.dealer_position = index
+                return index
+        return self.dealer_position
+
+    def players_with_chips(self):
+        return [p for p in self.players if p.chips > 0]
+
     def _post_blinds(self):
         if len(self.players) < 2:
             return
 
-        sb_pos = (self.dealer_position + 1) % len(self.players)
-        bb_pos = (self.dealer_position + 2) % len(self.players)
+        sb_pos = self._next_seat(self.dealer_position)
+        bb_pos = self._next_seat(sb_pos)
 
-        if sb_pos < len(self.players):
-            self.players[sb_pos].make_bet(self.small_blind)
-            self.players_acted_in_round.add(self.players[sb_pos])
+        # Игрок, которому не хватает фишек на блайнд, ставит всё, что есть
+        small_blind = self.players[sb_pos]
+        self._bet(small_blind, min(self.small_blind, small_blind.chips))
 
-        if bb_pos < len(self.players):
-            self.players[bb_pos].make_bet(self.big_blind)
-            self.players_acted_in_round.add(self.players[bb_pos])
-            self.current_bet = self.big_blind
+        big_blind = self.players[bb_pos]
+        self._bet(big_blind, min(self.big_blind, big_blind.chips))
+        self.current_bet = self.big_blind
 
-        self.pot = self.small_blind + self.big_blind
+        # Блайнды считаются ходом; малый блайнд ещё должен доставить фишки
+        for player in (small_blind, big_blind):
+            self.acted_mask |= 1 << player.position
+            self._settle(player)
+
+    def _bet(self, player, amount):
+        """Поставить фишки игрока и сразу записать их в банк"""
+        if not player.make_bet(amount):
+            return False
+        self.pot += amount
+        self.pots.add(player, amount, player.all_in)
+        return True
+
+    def _settle(self, player):
+        """Отметить в owing_mask, должен ли ходивший игрок доставить фишки"""
+        # current_bet сбрасывается в начале улицы, а total_bet копится за всю
+        # раздачу, поэтому ставка уравнена, если игрок не должен доставить
+        # фишки; игрок ва-банк доставить их не может и не задерживает раунд
+        bit = 1 << player.position
+        if player.total_bet < self.current_bet and not player.all_in and not player.folded:
+            self.owing_mask |= bit
+        else:
+            self.owing_mask &= ~bit
+
+    def _next_in_hand(self, position):
+        """Место следующего за position игрока, оставшегося в раздаче (None - таких нет)"""
+        mask = self.in_hand_mask
+        # Младший бит среди мест после position, иначе - с начала круга
+        later = mask >> (position + 1) << (position + 1)
+        if later:
+            return (later & -later).bit_length() - 1
+        if mask:
+            return (mask & -mask).bit_length() - 1
+        return None
 
     def check_round_complete(self):
         """Проверить, завершен ли текущий раунд торгов"""
-        active_not_folded = [p for p in self.active_players if not p.folded]
-
-        if len(active_not_folded) <= 1:
+        if self.in_hand_count <= 1:
             return True
 
-        all_acted = all(p in self.players_acted_in_round for p in active_not_folded)
-
-        bets_equal = all(p.total_bet == self.current_bet for p in active_not_folded)
-
-        if self.current_bet == 0 and all_acted:
-            return True
+        in_hand = self.in_hand_mask
+        if self.acted_mask & in_hand != in_hand:
+            return False
 
-        return all_acted and bets_equal
+        return self.current_bet == 0 or not self.owing_mask
 
     def next_phase(self):
         phases = ["preflop", "flop", "turn", "river", "showdown"]
@@ -238,7 +436,8 @@ class PokerGame:
             self.game_phase = phases[current_index + 1]
 
             self.current_bet = 0
-            self.players_acted_in_round = set()
+            self.acted_mask = 0
+            self.owing_mask = 0
 
             for player in self.active_players:
                 player.bet = 0
@@ -262,14 +461,10 @@ class PokerGame:
                         player.show_cards = True
                 return True
 
-            start_pos = (self.dealer_position + 1) % len(self.players)
-            for i in range(len(self.players)):
-                idx = (start_pos + i) % len(self.players)
-                player = self.players[idx]
-                if player in self.active_players and not player.folded:
-                    self.current_player_index = idx
-                    self.round_start_index = idx
-                    break
+            idx = self._next_in_hand(self.dealer_position)
+            if idx is not None:
+                self.current_player_index = idx
+                self.round_start_index = idx
 
             return True
 
@@ -279,12 +474,19 @@ class PokerGame:
         if player.folded or not player.is_active:
             return False
 
-        self.players_acted_in_round.add(player)
+        self.acted_mask |= 1 << player.position
+        done = self._apply_action(player, action, amount)
+        self._settle(player)
+        return done
 
+    def _apply_action(self, player, action, amount):
         if action == "fold":
             player.fold()
-            if player in self.active_players:
-                self.active_players.remove(player)
+            self.pots.fold(player)
+            bit = 1 << player.position
+            if self.in_hand_mask & bit:
+                self.in_hand_mask &= ~bit
+                self.in_hand_count -= 1
             return True
 
         elif action == "check":
@@ -296,10 +498,7 @@ class PokerGame:
         elif action == "call":
             needed = self.current_bet - player.total_bet
             if needed > 0:
-                if player.make_bet(needed):
-                    self.pot += needed
-                    return True
-                return False
+                return self._bet(player, needed)
             return True
 
         elif action == "raise":
@@ -312,51 +511,65 @@ class PokerGame:
 
             total_needed = self.current_bet + amount - player.total_bet
             if total_needed > 0:
-                if player.make_bet(total_needed):
+                if self._bet(player, total_needed):
                     self.current_bet = player.total_bet
-                    self.pot += total_needed
-                    self.players_acted_in_round = {player}
+                    self._reopen(player)
                     return True
             return False
 
         elif action == "all_in":
             all_in_amount = player.chips
-            if player.make_bet(all_in_amount):
+            if self._bet(player, all_in_amount):
                 if player.total_bet > self.current_bet:
                     self.current_bet = player.total_bet
-                    self.players_acted_in_round = {player}
-                self.pot += all_in_amount
+                    self._reopen(player)
                 return True
 
         return False
 
+    def _reopen(self, player):
+        """Повышение: остальным снова нужно ответить на ставку"""
+        self.acted_mask = 1 << player.position
+        self.owing_mask = 0
+
     def next_player(self):
-        if not self.active_players:
+        next_index = self._next_in_hand(self.current_player_index)
+        if next_index is None:
             return None
 
-        start_index = self.current_player_index
+        self.current_player_index = next_index
+        return self.players[next_index]
 
-        for i in range(1, len(self.players) + 1):
-            next_index = (start_index + i) % len(self.players)
-            player = self.players[next_index]
+    def calculate_equity(self, **options):
+        """Эквити игроков, оставшихся в раздаче: {игрок: Equity}.
 
-            if player in self.active_players and not player.folded:
-                self.current_player_index = next_index
-                return player
+        Карты сбросивших игроков считаются вышедшими из колоды; options
+        передаются в equity.calculate_equity (samples, time_budget, ...).
+        """
+        from equity import calculate_equity
 
-        return None
+        contenders = [p for p in self.active_players if not p.folded]
+        dead_cards = [card for p in self.players if p.folded for card in p.hand]
+        result = calculate_equity([p.hand for p in contenders], self.community_cards,
+                                  dead_cards, **options)
+        return dict(zip(contenders, result.hands))
 
+    def metrics(self):
+        """Гистограммы задержек и счётчики (пустые, если сбор не включён)"""
+        return get_metrics().snapshot()
+
+    @timed("determine_winner")
     def determine_winner(self):
+        """Разделить основной и побочные банки; вернуть игроков, выигравших хотя бы один.
+
+        Выигрыши и возвраты не уравненных ставок остаются в self.payouts и
+        self.refunds.
+        """
         for player in self.active_players:
             if not player.folded:
                 player.show_cards = True
 
         active_not_folded = [p for p in self.active_players if not p.folded]
-        if len(active_not_folded) == 1:
-            winner = active_not_folded[0]
-            winner.chips += self.pot
-            return [winner]
-
         if not active_not_folded:
 
             win_amount = self.pot // len(self.players)
@@ -364,31 +577,16 @@ class PokerGame:
                 player.chips += win_amount
             return []
 
-        best_hand = None
-        winners = []
+        if len(active_not_folded) == 1:
+            # Остальные сбросили - руку оценивать не нужно
+            strengths = {active_not_folded[0]: 0}
+        else:
+            strengths = {p: PokerHand(p.hand + self.community_cards).strength for p in active_not_folded}
 
-        for player in active_not_folded:
-            all_cards = player.hand + self.community_cards
-            hand = PokerHand(all_cards)
+        self.payouts, self.refunds = self.pots.resolve(strengths, self.players)
+        for player, amount in self.payouts.items():
+            player.chips += amount
+        for player, amount in self.refunds.items():
+            player.chips += amount
 
-            if best_hand is None:
-                best_hand = hand
-                winners = [player]
-            else:
-                comparison = hand.compare(best_hand)
-                if comparison > 0:
-                    best_hand = hand
-                    winners = [player]
-                elif comparison == 0:
-                    winners.append(player)
-
-        if winners:
-            win_amount = self.pot // len(winners)
-            remainder = self.pot % len(winners)
-
-            for i, winner in enumerate(winners):
-                winner.chips += win_amount
-                if i == 0:
-                    winner.chips += remainder
-
-        return winners
\ No newline at end of file
+        return list(self.payouts)
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""Пул заранее сгенерированных RSA-ключей.
+
+Генерация ключа RSA-2048 занимает десятки-сотни миллисекунд, поэтому
+ключи создаются в фоновых процессах заранее: Player и Dealer берут
+готовый ключ из пула, а пул сразу заказывает замену. Пока ключ не готов,
+acquire ждёт его (промах); сколько раз ключ был готов сразу (попадание),
+сколько было промахов и сколько времени ушло на ожидание, показывает
+metrics().
+"""
+import atexit
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.backends import default_backend
+
+# Ключи для стола наибольшего размера: game_logic.MAX_PLAYERS игроков и дилер
+# (game_logic не импортируется, чтобы пул не тянул за собой движок)
+TABLE_MAX_PLAYERS = 10
+DEFAULT_POOL_SIZE = TABLE_MAX_PLAYERS + 1
+DEFAULT_WORKERS = 2
+KEY_SIZE = 2048
+
+
+def _generate_key_der(key_size):
+    """Сгенерировать ключ в процессе пула и вернуть его в DER (объекты ключей не сериализуются pickle)"""
+    private_key = rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=key_size,
+        backend=default_backend()
+    )
+    return private_key.private_bytes(
+        serialization.Encoding.DER,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+
+
+class KeyPool:
+    def __init__(self, size=DEFAULT_POOL_SIZE, workers=DEFAULT_WORKERS, key_size=KEY_SIZE):
+        self.size = size
+        self.key_size = key_size
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._pending = deque()
+        self._pid = os.getpid()
+
+        self.hits = 0
+        self.misses = 0
+        self.wait_time = 0.0
+
+        for _ in range(size):
+            self._refill()
+
+    def _refill(self):
+        self._pending.append(self._executor.submit(_generate_key_der, self.key_size))
+
+    def acquire(self):
+        """Взять готовый закрытый ключ (или дождаться его) и заказать замену"""
+        future = self._pending.popleft()
+        self._refill()
+
+        if future.done():
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        start = time.perf_counter()
+        key_der = future.result()
+        self.wait_time += time.perf_counter() - start
+
+        # Ключ создан нашим же процессом, повторная проверка простых чисел
+        # стоит дороже самой выдачи ключа
+        return serialization.load_der_private_key(key_der, password=None,
+                                                  unsafe_skip_rsa_key_validation=True)
+
+    def metrics(self):
+        """Статистика пула"""
+        return {
+            "size": self.size,
+            "ready": sum(1 for future in self._pending if future.done()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "wait_time": self.wait_time,
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_default_pool = None
+
+
+def get_key_pool():
+    """Общий пул ключей процесса (создаётся при первом обращении)"""
+    global _default_pool
+    # После fork дочерний процесс не может пользоваться пулом родителя
+    if _default_pool is None or _default_pool._pid != os.getpid():
+        _default_pool = KeyPool()
+        atexit.register(_default_pool.close)
+    return _default_pool
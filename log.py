@@ -0,0 +1,84 @@
+"""Журнал игры на основе стандартного logging.
+
+Модули берут логгер через get_logger с коротким именем подсистемы
+(get_logger("game") - логгер poker.game) и передают аргументы
+сообщения отдельно (logger.debug("Карта %s", card)): если уровень
+выключен, строка не форматируется и объекты не превращаются в текст.
+Структурные поля передаются через extra и попадают в JSON-журнал.
+
+Настройка - configure() или переменные окружения:
+
+    POKER_LOG_LEVEL=DEBUG python main.py
+    POKER_LOG_JSON=audit.jsonl python simulate.py --secure
+
+Без настройки выводятся только предупреждения и ошибки.
+"""
+import json
+import logging
+import os
+
+ROOT_LOGGER = "poker"
+DEFAULT_LEVEL = "WARNING"
+CONSOLE_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+# Атрибуты LogRecord, которые не считаются структурными полями
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def get_logger(name):
+    """Логгер модуля внутри иерархии poker"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Одна запись - одна строка JSON: время, уровень, логгер, сообщение и поля extra"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure(level=None, json_path=None, json_level="DEBUG"):
+    """Настроить вывод журнала poker.
+
+    level - уровень консоли (по умолчанию POKER_LOG_LEVEL или WARNING);
+    json_path - файл JSON-журнала (по умолчанию POKER_LOG_JSON), в который
+    пишутся записи начиная с json_level. Повторный вызов заменяет прежние
+    обработчики.
+    """
+    level = (level or os.environ.get("POKER_LOG_LEVEL") or DEFAULT_LEVEL).upper()
+    json_path = json_path or os.environ.get("POKER_LOG_JSON")
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.propagate = False
+
+    console = logging.StreamHandler()
+    console.setLevel(level)
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    logger.addHandler(console)
+    levels = [console.level]
+
+    if json_path:
+        sink = logging.FileHandler(json_path, encoding="utf-8")
+        sink.setLevel(json_level.upper())
+        sink.setFormatter(JsonLinesFormatter())
+        logger.addHandler(sink)
+        levels.append(sink.level)
+
+    # Уровень логгера - самый подробный из обработчиков: всё, что ниже,
+    # отсекается ещё до создания записи
+    logger.setLevel(min(levels))
+    return logger
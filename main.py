@@ -1,6 +1,10 @@
 import pygame
 import sys
-from ui import PokerUI
+from game_logic import MIN_PLAYERS, MAX_PLAYERS
+from keypool import get_key_pool
+from log import configure as configure_logging
+from styles import render_text
+from ui import PokerUI, FramePolicy
 
 
 def get_player_count():
@@ -12,14 +16,18 @@ def get_player_count():
     font_large = pygame.font.SysFont("arial", 36, bold=True)
     font_medium = pygame.font.SysFont("arial", 28)
     font_small = pygame.font.SysFont("arial", 20)
+    clock = pygame.time.Clock()
+    frame_policy = FramePolicy.from_env()
 
     player_count = 3
     buttons = []
 
-    for i in range(2, 5):
+    # Кнопки всех допустимых размеров стола в один ряд по центру
+    row_width = (MAX_PLAYERS - MIN_PLAYERS + 1) * 60 - 10
+    for i in range(MIN_PLAYERS, MAX_PLAYERS + 1):
         buttons.append({
             "num": i,
-            "rect": pygame.Rect(220 + (i - 2) * 60, 220, 50, 50),
+            "rect": pygame.Rect(600 // 2 - row_width // 2 + (i - MIN_PLAYERS) * 60, 220, 50, 50),
             "text": str(i)
         })
 
@@ -27,13 +35,13 @@ def get_player_count():
     while running:
         screen.fill((34, 139, 34))
 
-        title = font_large.render("TEXAS HOLD'EM", True, (255, 215, 0))
+        title = render_text(font_large, "TEXAS HOLD'EM", True, (255, 215, 0))
         screen.blit(title, (600 // 2 - title.get_width() // 2, 60))
 
-        subtitle = font_medium.render("ПОКЕР", True, (255, 255, 255))
+        subtitle = render_text(font_medium, "ПОКЕР", True, (255, 255, 255))
         screen.blit(subtitle, (600 // 2 - subtitle.get_width() // 2, 110))
 
-        instr = font_medium.render("Количество игроков:", True, (255, 255, 255))
+        instr = render_text(font_medium, "Количество игроков:", True, (255, 255, 255))
         screen.blit(instr, (600 // 2 - instr.get_width() // 2, 160))
 
         mouse_pos = pygame.mouse.get_pos()
@@ -45,7 +53,7 @@ def get_player_count():
             pygame.draw.rect(screen, color, button["rect"], border_radius=8)
             pygame.draw.rect(screen, (0, 0, 0), button["rect"], 2, border_radius=8)
 
-            num_text = font_medium.render(button["text"], True, (255, 255, 255))
+            num_text = render_text(font_medium, button["text"], True, (255, 255, 255))
             screen.blit(num_text, (
                 button["rect"].x + button["rect"].width // 2 - num_text.get_width() // 2,
                 button["rect"].y + button["rect"].height // 2 - num_text.get_height() // 2
@@ -57,17 +65,20 @@ def get_player_count():
         pygame.draw.rect(screen, start_color, start_rect, border_radius=8)
         pygame.draw.rect(screen, (0, 0, 0), start_rect, 2, border_radius=8)
 
-        start_text = font_medium.render("ИГРАТЬ", True, (255, 255, 255))
+        start_text = render_text(font_medium, "ИГРАТЬ", True, (255, 255, 255))
         screen.blit(start_text, (
             start_rect.x + start_rect.width // 2 - start_text.get_width() // 2,
             start_rect.y + start_rect.height // 2 - start_text.get_height() // 2
         ))
 
 
-        instruction = font_small.render("Играйте, передавая устройство по очереди", True, (200, 200, 200))
+        instruction = render_text(font_small, "Играйте, передавая устройство по очереди", True, (200, 200, 200))
         screen.blit(instruction, (600 // 2 - instruction.get_width() // 2, 400))
 
-        for event in pygame.event.get():
+        pygame.display.flip()
+
+        # Меню статично: кадр перерисовывается только после ввода
+        for event in frame_policy.events(clock):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -83,8 +94,6 @@ def get_player_count():
                     if start_rect.collidepoint(event.pos):
                         running = False
 
-        pygame.display.flip()
-
     return player_count
 
 
@@ -95,6 +104,13 @@ def main():
     print("Игра для нескольких игроков за одним устройством")
     print("=" * 45)
 
+    configure_logging()
+
+    # Ключи игроков генерируются в фоне, пока выбирается число игроков
+    get_key_pool()
+
+    # Один стол - одна сессия: окно, шрифты, дилер и игроки с их ключами
+    # живут, пока игроки не вернутся в меню, а фишки переходят между раздачами
     while True:
         num_players = get_player_count()
         print(f"Начинаем игру с {num_players} игроками...")
@@ -103,6 +119,7 @@ def main():
         if not should_return_to_menu:
             break
 
+    pygame.quit()
     print("Игра завершена.")
 
 
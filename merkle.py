@@ -0,0 +1,75 @@
+"""Дерево Меркла для пакетной подписи сдачи.
+
+Дилер фиксирует все карты раздачи записями (соль, карта, получатель),
+строит над ними дерево Меркла и подписывает только корень. Игрок
+получает вместе с картой короткое доказательство включения - хэши
+соседних узлов от листа до корня - и проверяет его несколькими SHA-256
+вместо проверки RSA-подписи на каждую карту.
+"""
+import hashlib
+
+# Разные префиксы не дают выдать внутренний узел за лист и наоборот
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(salt, card_id, recipient):
+    """Хэш записи о сданной карте"""
+    data = f"{salt}:{card_id}:{recipient}".encode()
+    return hashlib.sha256(LEAF_PREFIX + data).digest()
+
+
+def _node_hash(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def build_levels(leaves):
+    """Все уровни дерева от листьев до корня.
+
+    Узел без пары переносится на следующий уровень без изменений (а не
+    хэшируется сам с собой), чтобы разные наборы листьев не давали один
+    корень.
+    """
+    if not leaves:
+        raise ValueError("Дерево Меркла строится хотя бы из одного листа")
+
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def inclusion_proof(levels, index):
+    """Доказательство включения листа: список (сосед слева?, хэш соседа)"""
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append((sibling < index, level[sibling]))
+        index //= 2
+    return proof
+
+
+def verify_proof(leaf, proof, root):
+    """Проверить, что лист входит в дерево с данным корнем"""
+    node = leaf
+    for sibling_is_left, sibling in proof:
+        node = _node_hash(sibling, node) if sibling_is_left else _node_hash(node, sibling)
+    return node == root
+
+
+def verify_deal_record(record, verify_signature):
+    """Проверить запись сдачи после раздачи.
+
+    record - результат Dealer.deal_record(); verify_signature(signature,
+    data) - проверка подписи дилера (например, Player.verify_sign).
+    Пересчитывает корень по всем раскрытым записям и проверяет его подпись.
+    """
+    leaves = [leaf_hash(entry["salt"], entry["card"], entry["recipient"])
+              for entry in record["entries"]]
+    root = build_levels(leaves)[-1][0]
+    return root.hex() == record["root"] and verify_signature(bytes.fromhex(record["signature"]), root)
@@ -0,0 +1,168 @@
+"""Счётчики и гистограммы задержек горячих участков игры.
+
+Инструментированные места (генерация ключей, тасовка, шифрование,
+подпись, расшифровка, проверка, оценка руки, determine_winner, кадр
+интерфейса) ничего не записывают, пока сбор выключен: остаётся только
+проверка одного флага. Включение:
+
+    PokerGame(..., instrument=True)        # сводка: game.metrics()
+    POKER_METRICS=metrics.json python main.py   # сводка в файл при выходе
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+# Точность гистограммы: 2^SUB_BITS корзины на каждую степень двойки
+# (погрешность квантилей не больше 25%)
+SUB_BITS = 2
+_SUB_COUNT = 1 << SUB_BITS
+PERCENTILES = (50, 90, 99)
+
+
+def _bucket(ns):
+    """Номер корзины для длительности в наносекундах"""
+    bits = ns.bit_length()
+    if bits <= SUB_BITS + 1:
+        return ns
+    shift = bits - SUB_BITS - 1
+    return (shift << SUB_BITS) + (ns >> shift)
+
+
+def _bucket_bounds(index):
+    """Границы корзины [нижняя, верхняя) в наносекундах"""
+    if index < 2 * _SUB_COUNT:
+        return index, index + 1
+    shift = (index >> SUB_BITS) - 1
+    mantissa = index - (shift << SUB_BITS)
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class Histogram:
+    """Логарифмическая гистограмма длительностей"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets = Counter()
+
+    def record(self, ns):
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.buckets[_bucket(ns)] += 1
+
+    def percentile(self, p):
+        """Верхняя граница корзины, в которую попадает p-й процентиль, нс"""
+        if not self.count:
+            return 0
+        rank = self.count * p / 100
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(_bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def summary(self):
+        """Сводка в микросекундах"""
+        summary = {
+            "count": self.count,
+            "total_ms": self.total / 1e6,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0,
+            "min_us": (self.min or 0) / 1e3,
+            "max_us": self.max / 1e3,
+        }
+        for p in PERCENTILES:
+            summary[f"p{p}_us"] = self.percentile(p) / 1e3
+        return summary
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, name, ns):
+        """Записать длительность участка name"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.record(ns)
+
+    def incr(self, name, value=1):
+        """Увеличить счётчик (только при включённом сборе)"""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += value
+
+    def snapshot(self):
+        """Текущие гистограммы и счётчики"""
+        with self._lock:
+            return {
+                "histograms": {name: h.summary() for name, h in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def dump(self, path):
+        """Записать сводку в JSON-файл"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+
+METRICS = Metrics()
+_dump_paths = set()
+
+
+def get_metrics():
+    """Общий реестр метрик процесса"""
+    return METRICS
+
+
+def enable(dump_path=None):
+    """Включить сбор; dump_path - куда записать сводку при выходе"""
+    METRICS.enabled = True
+    if dump_path and dump_path not in _dump_paths:
+        _dump_paths.add(dump_path)
+        atexit.register(METRICS.dump, dump_path)
+
+
+def disable():
+    METRICS.enabled = False
+
+
+def timed(name):
+    """Декоратор: записывать длительность вызовов в гистограмму name"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                METRICS.observe(name, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+if os.environ.get("POKER_METRICS"):
+    enable(os.environ["POKER_METRICS"])
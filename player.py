@@ -1,24 +1,18 @@
-from deck import Card, Suit, Rank
+from deck import Card, card_aad
 import hashlib
 import random
 import os
 import json
 import base64
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes
-
-types_of_cards = []
-i = 0
-for suit in Suit:
-    for rank in Rank:
-        types_of_cards.append(Card(rank, suit))
-        types_of_cards[-1].id = i
-        i += 1
+from log import get_logger
+from metrics import get_metrics
+from merkle import leaf_hash, verify_proof
+
+logger = get_logger("player")
+
 
 class Player:
-    def __init__(self, name, position, chips=1000):
+    def __init__(self, name, position, chips=1000, secure=True, crypto="rsa"):
         self.name = name
         self.position = position
         self.hand = []
@@ -30,80 +24,143 @@ class Player:
         self.is_active = True
         self.is_turn = False
         self.show_cards = False
+        self.private_key = None
+        self.public_key = None
+        self.crypto = None
 
-        private_key, public_key = self.generate_key_pair()
+        if secure:
+            # Криптография загружается только для шифрованной сдачи
+            from crypto import get_provider
+            self.crypto = get_provider(crypto)
 
-        self.private_key = private_key
-        self.public_key = public_key
+            private_key, public_key = self.generate_key_pair()
 
-        print(f"Приватный ключ игрока {self.name}:", self.private_key)
-        print(f"Публичный ключ игрока {self.name}:", self.public_key)
+            self.private_key = private_key
+            self.public_key = public_key
 
         self.dealer_public_key = None
+        self.session = None
+        self.session_cards = 0
+        # Корни деревьев сдачи, подпись которых уже проверена
+        self.verified_roots = set()
 
     def generate_key_pair(self):
-        print(f"Создаются ключи для {self.name}...")
+        logger.debug("%s создает ключи (%s)", self.name, self.crypto.name,
+                     extra={"player": self.name, "profile": self.crypto.name})
 
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
+        private_key = self.crypto.generate_private_key()
 
-        public_key = private_key.public_key()
+        public_key = self.crypto.public_key(private_key)
 
         return private_key, public_key
 
-    def verify_sign(self, signature, data):
-        try:
-            self.dealer_public_key.verify(
-                signature,
-                data,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
-
-            return True
-
-        except Exception:
+    def verify_sign(self, signature, data, proof=None):
+        """Проверить подпись дилера.
+
+        Если передано доказательство включения proof = (корень, путь),
+        data - лист дерева сдачи, а signature - подпись корня: проверяется
+        путь от листа до корня, а подпись корня - только один раз за раздачу.
+        """
+        if proof is not None:
+            root, path = proof
+            if not verify_proof(data, path, root):
+                return False
+            if root in self.verified_roots:
+                return True
+            data = root
+
+        if not self.crypto.verify(self.dealer_public_key, signature, data):
+            get_metrics().incr("verify_failures")
             return False
 
+        if proof is not None:
+            self.verified_roots.add(root)
+        return True
+
     def decrypt_card(self, data_enc, signature):
-        print(f"{self.name} расшифровывает карту...")
-        plaintext = self.private_key.decrypt(
-            data_enc,
-            padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                         algorithm=hashes.SHA256(),
-                         label=None)
-        )
+        plaintext = self.crypto.open(self.private_key, data_enc)
         data_dec = json.loads(plaintext.decode('utf-8'))
 
         card_id = data_dec['card']
         salt = data_dec['salt']
 
-        print(f"{self.name} проверяет подлинность подписи...")
-
         verify_data = salt.encode() + card_id.encode()
         is_valid = self.verify_sign(signature, verify_data)
 
         if not is_valid:
-            print("Цифровая подпись некорректна")
+            logger.warning("%s: цифровая подпись карты некорректна", self.name,
+                           extra={"player": self.name})
         else:
-            print("Цифровая подпись подтверждена")
-            self.add_card(types_of_cards[int(card_id)])
-            print(f"{self.name} получает карту", self.hand[-1].rank, self.hand[-1].suit)
+            self.add_card(Card.from_code(int(card_id)))
+            logger.debug("%s получает карту %s", self.name, self.hand[-1],
+                         extra={"player": self.name, "card": int(card_id)})
+
+    def accept_session(self, key_enc, signature):
+        """Принять сеансовый ключ дилера, проверив его подпись"""
+        logger.debug("%s получает сеансовый ключ", self.name, extra={"player": self.name})
+        self.session = None
+
+        if not self.verify_sign(signature, key_enc):
+            logger.warning("%s: цифровая подпись сеансового ключа некорректна", self.name,
+                           extra={"player": self.name})
+            return False
+
+        from crypto import SessionCipher
+
+        session_key = self.crypto.open(self.private_key, key_enc)
+        self.session = SessionCipher(session_key)
+        self.session_cards = 0
+        return True
+
+    def open_card(self, sealed):
+        """Вскрыть карту, запечатанную сеансовым ключом"""
+        if self.session is None:
+            logger.warning("%s: нет сеансового ключа", self.name, extra={"player": self.name})
+            return
+
+        from cryptography.exceptions import InvalidTag
+
+        # Номер в сеансе занят, даже если карта не вскрылась: сеанс длится
+        # всю игру, и счётчики игрока и дилера не должны разойтись
+        index = self.session_cards
+        self.session_cards += 1
+        try:
+            plaintext = self.session.open(sealed, card_aad(self.name, index))
+        except InvalidTag:
+            logger.warning("%s: карта повреждена или подменена", self.name, extra={"player": self.name})
+            return
+
+        card_id = json.loads(plaintext.decode('utf-8'))['card']
+        self.add_card(Card.from_code(int(card_id)))
+        logger.debug("%s получает карту %s", self.name, self.hand[-1],
+                     extra={"player": self.name, "card": int(card_id)})
+
+    def receive_batch_card(self, card_enc, root, signature, path):
+        """Расшифровать карту пакетной сдачи и проверить её включение в подписанное дерево"""
+        plaintext = self.crypto.open(self.private_key, card_enc)
+        data_dec = json.loads(plaintext.decode('utf-8'))
+
+        card_id = data_dec['card']
+        leaf = leaf_hash(data_dec['salt'], card_id, self.name)
+
+        if not self.verify_sign(signature, leaf, (root, path)):
+            logger.warning("%s: доказательство включения карты некорректно", self.name,
+                           extra={"player": self.name})
+        else:
+            self.add_card(Card.from_code(int(card_id)))
+            logger.debug("%s получает карту %s", self.name, self.hand[-1],
+                         extra={"player": self.name, "card": int(card_id)})
 
     def reset_hand(self):
         """Сбросить руку и состояние для нового раунда"""
         self.hand = []
+        self.verified_roots.clear()
         self.bet = 0
         self.total_bet = 0
         self.folded = False
         self.all_in = False
-        self.is_active = True
+        # Игрок без фишек пропускает раздачу
+        self.is_active = self.chips > 0
         self.show_cards = False
 
     def add_card(self, card):
@@ -0,0 +1,129 @@
+"""Банк раздачи: основной и побочные банки.
+
+Ставки записываются в банк сразу при действии игрока (PotLedger.add).
+Банк разбит на слои по уровням ва-банка: слой - вклады от уровня
+предыдущего банка до своего. Когда игрок идёт ва-банк на сумму, которой
+ещё нет среди уровней, слой с этой суммой делится на два, и игрок
+перестаёт претендовать на слои выше. Претенденты на банк - игроки,
+которые не сбросили карты и не пошли ва-банк на меньшую сумму.
+
+При вскрытии каждая рука оценивается один раз, а каждый банк достаётся
+лучшим рукам своих претендентов.
+"""
+
+
+class Pot:
+    """Слой банка: вклады выше уровня предыдущего банка и не выше cap"""
+    __slots__ = ("cap", "amount", "eligible")
+
+    def __init__(self, cap=None, amount=0, eligible=()):
+        # cap None - верхний банк без ограничения
+        self.cap = cap
+        self.amount = amount
+        self.eligible = set(eligible)
+
+    def __repr__(self):
+        return f"Pot(cap={self.cap}, amount={self.amount}, eligible={len(self.eligible)})"
+
+
+class PotLedger:
+    def __init__(self, players=()):
+        # Сколько каждый игрок поставил за раздачу
+        self.contributions = {}
+        self.pots = [Pot(eligible=players)]
+
+    @property
+    def total(self):
+        return sum(pot.amount for pot in self.pots)
+
+    @property
+    def main(self):
+        return self.pots[0]
+
+    @property
+    def side_pots(self):
+        return [pot for pot in self.pots[1:] if pot.amount]
+
+    def add(self, player, amount, all_in=False):
+        """Записать ставку; all_in - после неё у игрока не осталось фишек"""
+        before = self.contributions.get(player, 0)
+        after = before + amount
+        self.contributions[player] = after
+
+        pots = self.pots
+        if len(pots) == 1 or pots[-2].cap <= before:
+            # Обычный случай: вся ставка идёт в верхний банк
+            pots[-1].amount += amount
+        else:
+            low = 0
+            for pot in pots:
+                high = after if pot.cap is None else min(pot.cap, after)
+                share = high - max(low, before)
+                if share > 0:
+                    pot.amount += share
+                if pot.cap is None or after <= pot.cap:
+                    break
+                low = pot.cap
+
+        if all_in:
+            self._cap(player, after)
+
+    def fold(self, player):
+        """Сбросивший игрок не претендует ни на один банк"""
+        for pot in self.pots:
+            pot.eligible.discard(player)
+
+    def _cap(self, player, level):
+        """Игрок пошёл ва-банк на сумму level: отсечь побочный банк"""
+        low = 0
+        for index, pot in enumerate(self.pots):
+            if pot.cap is not None and level > pot.cap:
+                low = pot.cap
+                continue
+
+            if pot.cap != level:
+                # Ва-банк - редкое событие, поэтому вклады в новый слой
+                # пересчитываются по всем игрокам
+                lower = Pot(level, eligible=pot.eligible)
+                lower.amount = sum(min(c, level) - low for c in self.contributions.values() if c > low)
+                pot.amount -= lower.amount
+                self.pots.insert(index, lower)
+
+            for upper in self.pots[index + 1:]:
+                upper.eligible.discard(player)
+            return
+
+    def resolve(self, strengths, order):
+        """Разделить банки по силе рук.
+
+        strengths - {игрок: сила руки} для всех, кто дошёл до вскрытия;
+        order - порядок игроков, первый из победителей получает нечётные
+        фишки. Возвращает (выигрыши, возвраты): {игрок: фишки}. Слой, в
+        который ставил только один игрок, - не уравненная ставка, она
+        возвращается.
+        """
+        payouts = {}
+        refunds = {}
+        low = 0
+        for pot in self.pots:
+            if pot.amount:
+                contributors = [p for p, c in self.contributions.items() if c > low]
+                if len(contributors) == 1 and contributors[0] in strengths:
+                    refunds[contributors[0]] = refunds.get(contributors[0], 0) + pot.amount
+                else:
+                    self._award(pot, strengths, order, payouts)
+            low = pot.cap if pot.cap is not None else low
+        return payouts, refunds
+
+    @staticmethod
+    def _award(pot, strengths, order, payouts):
+        contenders = [p for p in order if p in pot.eligible and p in strengths]
+        if not contenders:
+            # Все претенденты сбросили - фишки слоя достаются дошедшим до вскрытия
+            contenders = [p for p in order if p in strengths]
+        best = max(strengths[p] for p in contenders)
+        winners = [p for p in contenders if strengths[p] == best]
+
+        share, remainder = divmod(pot.amount, len(winners))
+        for i, winner in enumerate(winners):
+            payouts[winner] = payouts.get(winner, 0) + share + (remainder if i == 0 else 0)
@@ -0,0 +1,229 @@
+"""Безголовая симуляция игры без pygame.
+
+Раздачи целиком проходят через PokerGame (start_new_hand, player_action,
+next_player, next_phase, determine_winner) так же, как их ведёт PokerUI,
+а решения игроков принимают стратегии - функции strategy(game, player),
+возвращающие пару (действие, сумма).
+
+    python simulate.py --players 6 --hands 1000000 --workers 8
+    python simulate.py --players 4 --hands 1000 --strategies strength,random
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from evaluator import category, PAIR, TWO_PAIR
+from game_logic import PokerGame, PokerHand, DEALING_MODES, CRYPTO_PROFILES, MIN_PLAYERS, MAX_PLAYERS
+from log import configure as configure_logging
+
+MAX_ACTIONS_PER_HAND = 1000
+FALLBACK_ACTIONS = ("check", "call", "all_in", "fold")
+
+
+def passive_strategy(game, player):
+    """Чек, если можно, иначе колл"""
+    if player.total_bet >= game.current_bet:
+        return "check", 0
+    return "call", 0
+
+
+def random_strategy(game, player):
+    """Случайные действия с редкими рейзами и ва-банком"""
+    roll = random.random()
+    if roll < 0.02:
+        return "all_in", 0
+    if roll < 0.15:
+        return "raise", player.total_bet - game.current_bet + 2 * game.big_blind
+    if roll < 0.3 and player.total_bet < game.current_bet:
+        return "fold", 0
+    return passive_strategy(game, player)
+
+
+def strength_strategy(game, player):
+    """Рейз с двумя парами и сильнее, колл с парой, иначе чек или фолд"""
+    strength = category(PokerHand(player.hand + game.community_cards).strength)
+    if strength >= TWO_PAIR:
+        return "raise", player.total_bet - game.current_bet + 2 * game.big_blind
+    if strength >= PAIR or game.game_phase == "preflop":
+        return passive_strategy(game, player)
+    if player.total_bet >= game.current_bet:
+        return "check", 0
+    return "fold", 0
+
+
+STRATEGIES = {
+    "passive": passive_strategy,
+    "random": random_strategy,
+    "strength": strength_strategy,
+}
+
+
+def _act(game, player, strategy):
+    """Выполнить ход стратегии; недопустимый ход заменяется первым допустимым"""
+    action, amount = strategy(game, player)
+    if game.player_action(player, action, amount):
+        return
+    for action in FALLBACK_ACTIONS:
+        if game.player_action(player, action):
+            return
+
+
+def play_hand(game, strategies):
+    """Сыграть одну раздачу до конца, вернуть список победителей"""
+    game.start_new_hand()
+    player = game.players[game.current_player_index]
+
+    for _ in range(MAX_ACTIONS_PER_HAND):
+        _act(game, player, strategies[player.position])
+
+        if game.in_hand_count <= 1:
+            return game.determine_winner()
+
+        player = game.next_player()
+        if game.check_round_complete():
+            game.next_phase()
+            if game.game_phase == "showdown":
+                return game.determine_winner()
+            player = game.players[game.current_player_index]
+        elif player is None:
+            break
+
+    raise RuntimeError(f"Раздача не завершилась (фаза {game.game_phase})")
+
+
+def run_table(num_players, hands, strategy_names, seed=None, chips=1000, secure=False,
+              dealing="per_card", crypto="rsa"):
+    """Сыграть hands раздач за одним столом и собрать статистику по местам"""
+    random.seed(seed)
+    strategies = [STRATEGIES[name] for name in strategy_names]
+
+    game = PokerGame(num_players, secure=secure, dealing=dealing, crypto=crypto)
+    rebuys = [0] * num_players
+    wins = [0] * num_players
+    showdowns = 0
+
+    for player in game.players:
+        player.chips = chips
+
+    for _ in range(hands):
+        for i, player in enumerate(game.players):
+            if player.chips < game.big_blind:
+                player.chips += chips
+                rebuys[i] += 1
+
+        winners = play_hand(game, strategies)
+        if game.game_phase == "showdown":
+            showdowns += 1
+        for winner in winners:
+            wins[winner.position] += 1
+
+        game.dealer_position = (game.dealer_position + 1) % num_players
+
+    game.close()
+
+    return {
+        "hands": hands,
+        "showdowns": showdowns,
+        "seats": [
+            {
+                "net_chips": player.chips - chips * (1 + rebuys[i]),
+                "rebuys": rebuys[i],
+                "hands_won": wins[i],
+            }
+            for i, player in enumerate(game.players)
+        ],
+    }
+
+
+def run_simulation(num_players, hands, workers=1, strategy_names=("random",),
+                   seed=None, chips=1000, secure=False, dealing="per_card", crypto="rsa"):
+    """Распределить раздачи по процессам, каждый играет за своим столом"""
+    strategy_names = [strategy_names[i % len(strategy_names)] for i in range(num_players)]
+    workers = max(1, min(workers, hands))
+    shares = [hands // workers + (1 if i < hands % workers else 0) for i in range(workers)]
+    seeds = [None if seed is None else seed + i for i in range(workers)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        tables = [run_table(num_players, shares[0], strategy_names, seeds[0], chips, secure,
+                            dealing, crypto)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tables = list(pool.map(run_table, [num_players] * workers, shares,
+                                   [strategy_names] * workers, seeds,
+                                   [chips] * workers, [secure] * workers,
+                                   [dealing] * workers, [crypto] * workers))
+    elapsed = time.perf_counter() - start
+
+    seats = []
+    for i in range(num_players):
+        seats.append({
+            "seat": i + 1,
+            "strategy": strategy_names[i],
+            "net_chips": sum(table["seats"][i]["net_chips"] for table in tables),
+            "rebuys": sum(table["seats"][i]["rebuys"] for table in tables),
+            "hands_won": sum(table["seats"][i]["hands_won"] for table in tables),
+        })
+
+    return {
+        "players": num_players,
+        "hands": hands,
+        "workers": workers,
+        "secure": secure,
+        "dealing": dealing if secure else None,
+        "crypto": crypto if secure else None,
+        "elapsed_sec": round(elapsed, 3),
+        "hands_per_sec": round(hands / elapsed, 1) if elapsed else None,
+        "showdowns": sum(table["showdowns"] for table in tables),
+        "chip_balance": sum(seat["net_chips"] for seat in seats),
+        "seats": seats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Безголовая симуляция техасского холдема")
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--strategies", default="random",
+                        help="стратегии по местам через запятую: " + ", ".join(STRATEGIES))
+    parser.add_argument("--chips", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--secure", action="store_true",
+                        help="сдавать карты с шифрованием, как в игре")
+    parser.add_argument("--dealing", choices=DEALING_MODES, default="per_card",
+                        help="способ шифрованной сдачи (вместе с --secure)")
+    parser.add_argument("--crypto", choices=CRYPTO_PROFILES, default="rsa",
+                        help="криптографический профиль (вместе с --secure)")
+    parser.add_argument("--output", help="записать JSON в файл вместо stdout")
+    parser.add_argument("--log-level", default=None,
+                        help="уровень журнала в stderr (по умолчанию POKER_LOG_LEVEL или WARNING)")
+    parser.add_argument("--log-json", default=None,
+                        help="писать журнал в файл JSON Lines (для аудита)")
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_json)
+
+    strategy_names = args.strategies.split(",")
+    unknown = [name for name in strategy_names if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"неизвестные стратегии: {', '.join(unknown)}")
+    if not MIN_PLAYERS <= args.players <= MAX_PLAYERS:
+        parser.error(f"за столом может быть от {MIN_PLAYERS} до {MAX_PLAYERS} игроков")
+
+    report = run_simulation(args.players, args.hands, args.workers, strategy_names,
+                            args.seed, args.chips, args.secure, args.dealing, args.crypto)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
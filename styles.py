@@ -1,4 +1,5 @@
-import pygame
+import math
+from collections import OrderedDict
 
 # Размеры окна
 SCREEN_WIDTH = 800
@@ -34,45 +35,24 @@ CARD_HEIGHT = 70
 CARD_RADIUS = 6
 CARD_SPACING = 12
 
-# Позиции игроков для каждого количества (x, y)
-# Фиксированные позиции для идеального отображения
-PLAYER_POSITIONS = {
-    2: [  # 2 игрока: сверху и снизу
-        (CENTER_X, 120),  # Верхний
-        (CENTER_X, SCREEN_HEIGHT - 120)  # Нижний
-    ],
-    3: [  # 3 игрока: треугольник
-        (CENTER_X, 160),  # Верхний
-        (CENTER_X + 100, SCREEN_HEIGHT - 180),  # Правый нижний
-        (CENTER_X - 100, SCREEN_HEIGHT - 180)  # Левый нижний
-    ],
-    4: [  # 4 игрока: квадрат
-        (CENTER_X, 120),  # Верхний
-        (CENTER_X + 200, CENTER_Y-100),  # Правый
-        (CENTER_X, SCREEN_HEIGHT - 120),  # Нижний
-        (CENTER_X - 200, CENTER_Y-100)  # Левый
-    ]
-    ,
-    5: [  # 5 игроков: пентагон
-        (CENTER_X, 120),  # Верхний
-        (CENTER_X + 180, 180),  # Правый верхний
-        (CENTER_X + 180, CENTER_Y + 160),  # Правый нижний
-
-        (CENTER_X, SCREEN_HEIGHT - 120),  # Нижний
-        (CENTER_X - 200, CENTER_Y + 100)  # Левый нижний
-    ],
-    6: [  # 6 игроков: шестиугольник
-        (CENTER_X, 120),  # Верхний
-        (CENTER_X + 180, 160),  # Правый верхний
-        (CENTER_X + 180, CENTER_Y + 80),  # Правый нижний
-        (CENTER_X, SCREEN_HEIGHT - 120),  # Нижний
-        (CENTER_X - 180, CENTER_Y + 80),  # Левый нижний
-        (CENTER_X - 180, 160)  # Левый верхний
-    ]
-}
-
-# Область информации (правая часть)
-INFO_AREA_X = SCREEN_WIDTH - 180  # Начинается слева от этой координаты
+# Места игроков - на эллипсе вокруг стола: первое сверху, остальные по часовой
+# стрелке через равные углы. Полуоси подобраны так, чтобы при 2-10 игроках
+# кружки и карты соседей не перекрывались; нижняя половина эллипса ниже
+# верхней, чтобы нижнее место оставалось над кнопками и панелью победителя
+# (нижние 90 пикселей экрана)
+SEAT_RADIUS_X = 330
+SEAT_RADIUS_Y = 240
+SEAT_RADIUS_Y_BOTTOM = 205
+# Зазор между кружком игрока и его картами: сверху над кружком имя, снизу -
+# ставка и статус, сбоку только кнопка дилера
+CARD_GAP_ABOVE = 28
+CARD_GAP_BELOW = 42
+CARD_GAP_SIDE = 8
+
+# Область информации о текущем игроке: полоса в правом верхнем углу под
+# заголовком, выше мест игроков при любом их числе
+INFO_AREA_X = SCREEN_WIDTH - 290  # Начинается слева от этой координаты
+INFO_AREA_Y = 62
 INFO_AREA_WIDTH = 0
 
 # Позиции кнопок (центрированы внизу)
@@ -86,8 +66,61 @@ BUTTONS = {
 }
 
 
+# Частота кадров: пока идёт фоновая задача (заставка сдачи или оценки рук),
+# цикл рисует ACTIVE_FPS кадров в секунду, а в статичной сцене спит до ввода (но не дольше
+# IDLE_TIMEOUT_MS, 0 - без ограничения). Переопределяются переменными
+# окружения POKER_FRAME_POLICY (adaptive/continuous), POKER_FPS и
+# POKER_IDLE_TIMEOUT_MS
+FRAME_POLICY = "adaptive"
+ACTIVE_FPS = 60
+IDLE_TIMEOUT_MS = 1000
+
+# Кэш отрисованных надписей: имена, фишки, ранги и масти карт почти не
+# меняются между кадрами, поэтому font.render вызывается один раз на надпись
+TEXT_CACHE_SIZE = 512
+
+
+class TextCache:
+    """LRU-кэш поверхностей с текстом по ключу (шрифт, текст, цвет, сглаживание)"""
+
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """То же, что font.render, но повторные надписи берутся из кэша"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, antialias, color)
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """Надпись из общего кэша (поверхность нельзя изменять - она общая)"""
+    return TEXT_CACHE.render(font, text, antialias, color)
+
+
 # Шрифты
 def init_fonts():
+    # pygame нужен только интерфейсу: константы и раскладка доступны без него
+    import pygame
+
     pygame.font.init()
     return {
         "title": pygame.font.SysFont("arial", 28, bold=True),
@@ -101,8 +134,14 @@ def init_fonts():
 
 
 def get_player_positions(num_players):
-    """Получить фиксированные позиции для заданного количества игроков"""
-    return PLAYER_POSITIONS.get(num_players, PLAYER_POSITIONS[6])[:num_players]
+    """Позиции игроков на эллипсе вокруг стола (первый игрок сверху)"""
+    positions = []
+    for i in range(num_players):
+        angle = 2 * math.pi * i / num_players
+        radius_y = SEAT_RADIUS_Y if math.cos(angle) > 0 else SEAT_RADIUS_Y_BOTTOM
+        positions.append((round(CENTER_X + SEAT_RADIUS_X * math.sin(angle)),
+                          round(CENTER_Y - radius_y * math.cos(angle))))
+    return positions
 
 
 def get_card_positions(player_x, player_y):
@@ -1,16 +1,141 @@
+import math
+import os
 import pygame
 import sys
-from styles import *
+import time
+from concurrent.futures import ThreadPoolExecutor
+from styles import (SCREEN_WIDTH, SCREEN_HEIGHT, CENTER_X, CENTER_Y, BACKGROUND, TABLE_COLOR,
+                    TABLE_BORDER, PLAYER_ACTIVE, PLAYER_INACTIVE, PLAYER_TURN, CARD_BACK,
+                    CARD_FRONT, TEXT_COLOR, TEXT_DARK, BUTTON_COLOR, BUTTON_HOVER, CHIPS_COLOR,
+                    CHIPS_TEXT_COLOR, INFO_BG_COLOR, PLAYER_RADIUS, CARD_WIDTH, CARD_HEIGHT,
+                    CARD_RADIUS, CARD_SPACING, CARD_GAP_ABOVE, CARD_GAP_BELOW, CARD_GAP_SIDE,
+                    INFO_AREA_X, INFO_AREA_Y, INFO_AREA_WIDTH, BUTTONS,
+                    FRAME_POLICY, ACTIVE_FPS, IDLE_TIMEOUT_MS,
+                    init_fonts, render_text, get_player_positions, get_community_card_positions)
+from deck import CARDS, DECK_SIZE
+from log import get_logger
+from metrics import METRICS
+
+logger = get_logger("ui")
+
+# Области слоёв сцены (с запасом на самый широкий текст слоя)
+INFO_RECT = pygame.Rect(0, 0, SCREEN_WIDTH, 60)
+POT_RECT = pygame.Rect(CENTER_X - 100, CENTER_Y - 25, 200, 50)
+_COMMUNITY_WIDTH = 5 * CARD_WIDTH + 4 * CARD_SPACING + 16
+COMMUNITY_RECT = pygame.Rect(CENTER_X - _COMMUNITY_WIDTH // 2 - 2, CENTER_Y - CARD_HEIGHT // 2 - 20,
+                             _COMMUNITY_WIDTH + 4, CARD_HEIGHT + 40)
+CURRENT_INFO_RECT = pygame.Rect(INFO_AREA_X, INFO_AREA_Y, SCREEN_WIDTH - INFO_AREA_X, 60)
+BUTTONS_RECT = pygame.Rect(BUTTONS["fold"][0] - 37, BUTTONS["fold"][1] - 18,
+                           BUTTONS["all_in"][0] - BUTTONS["fold"][0] + 74, 36)
+# Поле ввода суммы - в правом нижнем углу рядом с кнопками, панель победителя
+# занимает место кнопок: обе ниже мест игроков
+INPUT_RECT = pygame.Rect(SCREEN_WIDTH - 205, SCREEN_HEIGHT - 60, 200, 56)
+STATUS_RECT = pygame.Rect(CENTER_X - 150, CENTER_Y - CARD_HEIGHT // 2 - 70, 300, 44)
+WINNER_RECT = pygame.Rect(0, SCREEN_HEIGHT - 90, SCREEN_WIDTH, 90)
+
+# Сцены интерфейса: сдача и определение победителя идут в фоновом потоке,
+# а окно всё это время отвечает и показывает заставку
+SCENES = ("dealing", "betting", "evaluating", "showdown")
+SCENE_STATUS = {
+    "dealing": "Раздача карт",
+    "evaluating": "Определение победителя",
+}
 
 try:
     from game_logic import PokerGame
 except ImportError as e:
-    print(f"Ошибка импорта PokerGame: {e}")
+    logger.critical("Ошибка импорта PokerGame: %s", e)
     sys.exit(1)
 
 
+class FramePolicy:
+    """Когда рисовать следующий кадр.
+
+    adaptive - в статичной сцене цикл блокируется до события (или до
+    idle_timeout_ms), а с частотой fps рисует только во время анимации
+    (заставки фоновой задачи);
+    continuous - всегда fps кадров в секунду, как раньше.
+    """
+
+    MODES = ("adaptive", "continuous")
+
+    def __init__(self, mode=FRAME_POLICY, fps=ACTIVE_FPS, idle_timeout_ms=IDLE_TIMEOUT_MS):
+        if mode not in self.MODES:
+            raise ValueError(f"Неизвестный режим кадров: {mode}, допустимые: {', '.join(self.MODES)}")
+        self.mode = mode
+        self.fps = fps
+        self.idle_timeout_ms = idle_timeout_ms
+
+    @classmethod
+    def from_env(cls):
+        """Политика из переменных окружения (по умолчанию - из styles)"""
+        return cls(
+            mode=os.environ.get("POKER_FRAME_POLICY", FRAME_POLICY),
+            fps=int(os.environ.get("POKER_FPS", ACTIVE_FPS)),
+            idle_timeout_ms=int(os.environ.get("POKER_IDLE_TIMEOUT_MS", IDLE_TIMEOUT_MS)),
+        )
+
+    def events(self, clock, animating=False):
+        """Дождаться следующего кадра и вернуть накопившиеся события"""
+        if animating or self.mode == "continuous":
+            clock.tick(self.fps)
+            return pygame.event.get()
+
+        event = pygame.event.wait(self.idle_timeout_ms)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        # Время ожидания не должно попасть в следующий кадр анимации
+        clock.tick()
+        return events
+
+
+class CardAtlas:
+    """Все 52 лица карт и рубашка, отрисованные один раз в одну поверхность.
+
+    Лицо карты с кодом code лежит в прямоугольнике rects[code], рубашка -
+    в rects[BACK]. Окно игры фиксированного размера, поэтому атлас строится
+    один раз на стол.
+    """
+
+    BACK = DECK_SIZE
+
+    def __init__(self, fonts, size=(CARD_WIDTH, CARD_HEIGHT)):
+        self.size = size
+        width, height = size
+        self.surface = pygame.Surface((width * (DECK_SIZE + 1), height), pygame.SRCALPHA)
+        self.rects = [pygame.Rect(i * width, 0, width, height) for i in range(DECK_SIZE + 1)]
+
+        for card in CARDS:
+            self.draw_face(fonts, card, self.rects[card.code])
+        self.draw_back(self.rects[self.BACK])
+
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert_alpha()
+
+    def draw_face(self, fonts, card, card_rect):
+        pygame.draw.rect(self.surface, CARD_FRONT, card_rect, border_radius=CARD_RADIUS)
+        pygame.draw.rect(self.surface, (0, 0, 0), card_rect, 2, border_radius=CARD_RADIUS)
+
+        rank_color = card.get_color()
+
+        rank_text = fonts["card"].render(card.rank.value, True, rank_color)
+        self.surface.blit(rank_text, (card_rect.x + 6, card_rect.y + 4))
+
+        suit_text = fonts["card"].render(card.suit.value, True, rank_color)
+        self.surface.blit(suit_text, (card_rect.x + 6, card_rect.y + 25))
+
+    def draw_back(self, card_rect):
+        pygame.draw.rect(self.surface, CARD_BACK, card_rect, border_radius=CARD_RADIUS)
+        pygame.draw.rect(self.surface, (0, 0, 0), card_rect, 2, border_radius=CARD_RADIUS)
+
+    def blit(self, target, card, pos):
+        """Нарисовать лицо карты (или рубашку, если card - None) в точке pos"""
+        index = self.BACK if card is None else card.code
+        target.blit(self.surface, pos, self.rects[index])
+
+
 class PokerUI:
-    def __init__(self, num_players):
+    def __init__(self, num_players, frame_policy=None):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Texas Hold'em Poker")
@@ -18,19 +143,35 @@ class PokerUI:
         self.game = PokerGame(num_players)
         self.fonts = init_fonts()
         self.clock = pygame.time.Clock()
+        self.frame_policy = frame_policy or FramePolicy.from_env()
         self.running = True
+        self.return_to_menu = False
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="poker-ui")
+        self.task = None
+        self.on_task_done = None
+        self.scene = None
+        self.current_player = None
+        self.winners = []
+        self.hands_played = 1
         self.input_active = False
         self.input_text = ""
         self.num_players = num_players
         self.player_positions = get_player_positions(num_players)
 
-        self.game.start_new_hand()
-        self.current_player = self.game.players[self.game.current_player_index]
-        self.current_player.show_cards = True
-        self.current_player.is_turn = True
+        # Неизменная часть сцены рисуется один раз, кадры обновляют только
+        # изменившиеся области (см. render)
+        self.background = self.render_background()
+        self.card_atlas = CardAtlas(self.fonts)
+        self.player_rects = [self.player_rect(x, y) for x, y in self.player_positions]
+        self.layer_keys = {}
+        self.full_redraw = True
 
-    def draw_table(self):
-        self.screen.fill(BACKGROUND)
+        self.start_hand()
+
+    def render_background(self):
+        """Фон и стол - неизменная часть сцены"""
+        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        background.fill(BACKGROUND)
 
         table_rect = pygame.Rect(
             SCREEN_WIDTH // 4,
@@ -38,24 +179,24 @@ class PokerUI:
             SCREEN_WIDTH // 2,
             SCREEN_HEIGHT // 2
         )
-        pygame.draw.ellipse(self.screen, TABLE_COLOR, table_rect)
-        pygame.draw.ellipse(self.screen, TABLE_BORDER, table_rect, 5)
+        pygame.draw.ellipse(background, TABLE_COLOR, table_rect)
+        pygame.draw.ellipse(background, TABLE_BORDER, table_rect, 5)
 
         center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-        pygame.draw.circle(self.screen, (50, 50, 50), (center_x, center_y), 60)
+        pygame.draw.circle(background, (50, 50, 50), (center_x, center_y), 60)
+        return background
 
-        pot_text = self.fonts["title"].render(f"${self.game.pot}", True, (255, 215, 0))
-        pot_rect = pot_text.get_rect(center=(center_x, center_y))
+    def draw_pot(self):
+        pot_text = render_text(self.fonts["title"], f"${self.game.pot}", True, (255, 215, 0))
+        pot_rect = pot_text.get_rect(center=(CENTER_X, CENTER_Y))
         self.screen.blit(pot_text, pot_rect)
 
-        self.draw_game_info()
-
     def draw_game_info(self):
 
         info_bg = pygame.Rect(0, 0, SCREEN_WIDTH, 60)
         pygame.draw.rect(self.screen, (0, 0, 0, 180), info_bg)
 
-        phase_text = self.fonts["title"].render(
+        phase_text = render_text(self.fonts["title"],
             f"ТЕХАС ХОЛДЕМ | {self.game.game_phase.upper()}",
             True, TEXT_COLOR
         )
@@ -63,7 +204,7 @@ class PokerUI:
         self.screen.blit(phase_text, phase_rect)
 
         # Текущая ставка
-        bet_text = self.fonts["info"].render(
+        bet_text = render_text(self.fonts["info"],
             f"Текущая ставка: ${self.game.current_bet}",
             True, (255, 215, 0)
         )
@@ -72,99 +213,91 @@ class PokerUI:
 
     def draw_players(self):
         for i, player in enumerate(self.game.players):
-            if i >= len(self.player_positions):
-                continue
-
-            player_x, player_y = self.player_positions[i]
-
-            # Проверяем, не пересекается ли позиция с областью информации
-            #if player_x > INFO_AREA_X - 100:
-                #player_x = INFO_AREA_X - 100
-
-            # Определяем цвет игрока
-            if i >= self.num_players:
-                color = PLAYER_INACTIVE
-            elif player == self.current_player:
-                color = PLAYER_TURN
-            elif player.folded:
-                color = PLAYER_INACTIVE
-            elif player in self.game.active_players:
-                color = PLAYER_ACTIVE
-            else:
-                color = (180, 180, 180)
-
-            # Рисуем кружок игрока
-            pygame.draw.circle(self.screen, color, (player_x, player_y), PLAYER_RADIUS)
-            pygame.draw.circle(self.screen, (0, 0, 0), (player_x, player_y), PLAYER_RADIUS, 2)
-
-            # Имя игрока (над кружком)
-            name_text = self.fonts["player"].render(player.name, True, TEXT_COLOR)
-            name_rect = name_text.get_rect(center=(player_x, player_y - PLAYER_RADIUS - 12))
-            self.screen.blit(name_text, name_rect)
-
-            chips_bg_radius = PLAYER_RADIUS - 6
-            pygame.draw.circle(self.screen, CHIPS_COLOR, (player_x, player_y), chips_bg_radius)
-            pygame.draw.circle(self.screen, (0, 0, 0), (player_x, player_y), chips_bg_radius, 1)
-
-            chips_text = self.fonts["chips"].render(f"${player.chips}", True, CHIPS_TEXT_COLOR)
-            chips_rect = chips_text.get_rect(center=(player_x, player_y))
-            self.screen.blit(chips_text, chips_rect)
-
-            if player.bet > 0:
-                bet_bg = pygame.Rect(
-                    player_x - 35,
-                    player_y + PLAYER_RADIUS + 3,
-                    70, 18
-                )
-                pygame.draw.rect(self.screen, (255, 100, 100), bet_bg, border_radius=3)
-                pygame.draw.rect(self.screen, (0, 0, 0), bet_bg, 1, border_radius=3)
-
-                bet_text = self.fonts["info"].render(f"${player.bet}", True, TEXT_COLOR)
-                bet_rect = bet_text.get_rect(center=(player_x, player_y + PLAYER_RADIUS + 12))
-                self.screen.blit(bet_text, bet_rect)
-
-            status = ""
-            if player.folded:
-                status = "FOLD"
-            elif player.all_in:
-                status = "ALL-IN"
-
-            if status:
-                status_bg = pygame.Rect(
-                    player_x - 30,
-                    player_y + PLAYER_RADIUS + 23,
-                    60, 16
-                )
-                pygame.draw.rect(self.screen, (255, 50, 50), status_bg, border_radius=3)
-                pygame.draw.rect(self.screen, (0, 0, 0), status_bg, 1, border_radius=3)
-
-                status_text = self.fonts["info"].render(status, True, TEXT_COLOR)
-                status_rect = status_text.get_rect(center=(player_x, player_y + PLAYER_RADIUS + 31))
-                self.screen.blit(status_text, status_rect)
-
-
-            self.draw_player_cards(player, player_x, player_y)
+            self.draw_player(i, player)
 
-    def draw_player_cards(self, player, player_x, player_y):
+    def draw_player(self, i, player):
+        if i >= len(self.player_positions):
+            return
 
-        total_width = 2 * CARD_WIDTH + CARD_SPACING
-        start_x = player_x - total_width // 2
-        if start_x < 10:
-            start_x = 10
-        elif start_x + total_width > SCREEN_WIDTH - 10:
-            start_x = SCREEN_WIDTH - total_width - 10
+        player_x, player_y = self.player_positions[i]
+
+        # Проверяем, не пересекается ли позиция с областью информации
+        #if player_x > INFO_AREA_X - 100:
+            #player_x = INFO_AREA_X - 100
+
+        # Определяем цвет игрока
+        if i >= self.num_players:
+            color = PLAYER_INACTIVE
+        elif player == self.current_player:
+            color = PLAYER_TURN
+        elif player.folded:
+            color = PLAYER_INACTIVE
+        elif self.game.in_hand(player):
+            color = PLAYER_ACTIVE
+        else:
+            color = (180, 180, 180)
+
+        # Рисуем кружок игрока
+        pygame.draw.circle(self.screen, color, (player_x, player_y), PLAYER_RADIUS)
+        pygame.draw.circle(self.screen, (0, 0, 0), (player_x, player_y), PLAYER_RADIUS, 2)
+
+        # Имя игрока (над кружком)
+        name_text = render_text(self.fonts["player"], player.name, True, TEXT_COLOR)
+        name_rect = name_text.get_rect(center=(player_x, player_y - PLAYER_RADIUS - 12))
+        self.screen.blit(name_text, name_rect)
+
+        chips_bg_radius = PLAYER_RADIUS - 6
+        pygame.draw.circle(self.screen, CHIPS_COLOR, (player_x, player_y), chips_bg_radius)
+        pygame.draw.circle(self.screen, (0, 0, 0), (player_x, player_y), chips_bg_radius, 1)
+
+        chips_text = render_text(self.fonts["chips"], f"${player.chips}", True, CHIPS_TEXT_COLOR)
+        chips_rect = chips_text.get_rect(center=(player_x, player_y))
+        self.screen.blit(chips_text, chips_rect)
+
+        if player.bet > 0:
+            bet_bg = pygame.Rect(
+                player_x - 35,
+                player_y + PLAYER_RADIUS + 3,
+                70, 18
+            )
+            pygame.draw.rect(self.screen, (255, 100, 100), bet_bg, border_radius=3)
+            pygame.draw.rect(self.screen, (0, 0, 0), bet_bg, 1, border_radius=3)
+
+            bet_text = render_text(self.fonts["info"], f"${player.bet}", True, TEXT_COLOR)
+            bet_rect = bet_text.get_rect(center=(player_x, player_y + PLAYER_RADIUS + 12))
+            self.screen.blit(bet_text, bet_rect)
+
+        status = ""
+        if player.folded:
+            status = "FOLD"
+        elif player.all_in:
+            status = "ALL-IN"
+
+        if status:
+            status_bg = pygame.Rect(
+                player_x - 30,
+                player_y + PLAYER_RADIUS + 23,
+                60, 16
+            )
+            pygame.draw.rect(self.screen, (255, 50, 50), status_bg, border_radius=3)
+            pygame.draw.rect(self.screen, (0, 0, 0), status_bg, 1, border_radius=3)
 
+            status_text = render_text(self.fonts["info"], status, True, TEXT_COLOR)
+            status_rect = status_text.get_rect(center=(player_x, player_y + PLAYER_RADIUS + 31))
+            self.screen.blit(status_text, status_rect)
 
-        if player_y < SCREEN_HEIGHT // 2:
-            card_y = player_y + PLAYER_RADIUS + 40
-        else:
-            card_y = player_y - PLAYER_RADIUS - CARD_HEIGHT - 40
+        if i == self.game.dealer_position:
+            # Кнопка дилера
+            button_pos = (player_x + PLAYER_RADIUS + 4, player_y - PLAYER_RADIUS + 4)
+            pygame.draw.circle(self.screen, (255, 255, 255), button_pos, 10)
+            pygame.draw.circle(self.screen, (0, 0, 0), button_pos, 10, 1)
+            button_text = render_text(self.fonts["button"], "D", True, TEXT_DARK)
+            self.screen.blit(button_text, button_text.get_rect(center=button_pos))
 
-        if card_y + CARD_HEIGHT > SCREEN_HEIGHT - 120:
-            card_y = SCREEN_HEIGHT - 120 - CARD_HEIGHT - 10
+        self.draw_player_cards(player, player_x, player_y)
 
-        if card_y < 60:
-            card_y = 60
+    def draw_player_cards(self, player, player_x, player_y):
+        start_x, card_y = self.player_cards_origin(player_x, player_y)
 
         for i in range(2):
             card_x = start_x + i * (CARD_WIDTH + CARD_SPACING)
@@ -177,23 +310,28 @@ class PokerUI:
                 card_x, card_y, show_card
             )
 
-    def draw_card(self, card, x, y, visible=True):
-        if visible and card:
-            card_rect = pygame.Rect(x, y, CARD_WIDTH, CARD_HEIGHT)
-            pygame.draw.rect(self.screen, CARD_FRONT, card_rect, border_radius=CARD_RADIUS)
-            pygame.draw.rect(self.screen, (0, 0, 0), card_rect, 2, border_radius=CARD_RADIUS)
-
-            rank_color = card.get_color()
-
-            rank_text = self.fonts["card"].render(card.rank.value, True, rank_color)
-            self.screen.blit(rank_text, (x + 6, y + 4))
+    @staticmethod
+    def player_cards_origin(player_x, player_y):
+        """Левый верхний угол карт игрока: карты лежат между игроком и центром стола"""
+        total_width = 2 * CARD_WIDTH + CARD_SPACING
+        dx, dy = CENTER_X - player_x, CENTER_Y - player_y
+        distance = math.hypot(dx, dy) or 1
+        ux, uy = dx / distance, dy / distance
+
+        # Расстояние до центра карт вдоль направления к центру стола, чтобы
+        # карты не наезжали на кружок и подписи игрока
+        gap_y = CARD_GAP_BELOW if uy > 0 else CARD_GAP_ABOVE
+        reach = (PLAYER_RADIUS + abs(ux) * (CARD_GAP_SIDE + total_width / 2)
+                 + abs(uy) * (gap_y + CARD_HEIGHT / 2))
+
+        start_x = round(player_x + ux * reach - total_width / 2)
+        card_y = round(player_y + uy * reach - CARD_HEIGHT / 2)
+        start_x = min(max(start_x, 10), SCREEN_WIDTH - total_width - 10)
+        card_y = min(max(card_y, 60), SCREEN_HEIGHT - 120 - CARD_HEIGHT - 10)
+        return start_x, card_y
 
-            suit_text = self.fonts["card"].render(card.suit.value, True, rank_color)
-            self.screen.blit(suit_text, (x + 6, y + 25))
-        else:
-            card_rect = pygame.Rect(x, y, CARD_WIDTH, CARD_HEIGHT)
-            pygame.draw.rect(self.screen, CARD_BACK, card_rect, border_radius=CARD_RADIUS)
-            pygame.draw.rect(self.screen, (0, 0, 0), card_rect, 2, border_radius=CARD_RADIUS)
+    def draw_card(self, card, x, y, visible=True):
+        self.card_atlas.blit(self.screen, card if visible else None, (x, y))
 
     def draw_community_cards(self):
         if not self.game.community_cards:
@@ -220,31 +358,25 @@ class PokerUI:
         if not self.current_player:
             return
 
-        info_bg = pygame.Rect(INFO_AREA_X, 50, INFO_AREA_WIDTH, SCREEN_HEIGHT - 150)
+        info_bg = pygame.Rect(INFO_AREA_X, INFO_AREA_Y, INFO_AREA_WIDTH, 60)
         pygame.draw.rect(self.screen, INFO_BG_COLOR, info_bg, border_radius=0)
 
-        title_text = self.fonts["player"].render("ТЕКУЩИЙ ИГРОК", True, (255, 215, 0))
-        self.screen.blit(title_text, (INFO_AREA_X + 20, 70))
-
-        name_text = self.fonts["info"].render(f"Имя: {self.current_player.name}", True, TEXT_COLOR)
-        self.screen.blit(name_text, (INFO_AREA_X + 20, 100))
+        # Две строки: имя и карты, затем фишки, ставка и статус
+        title_text = render_text(self.fonts["player"], "ТЕКУЩИЙ:", True, (255, 215, 0))
+        self.screen.blit(title_text, (INFO_AREA_X + 10, INFO_AREA_Y + 4))
 
-        cards_text = self.fonts["info"].render("Карты:", True, TEXT_COLOR)
-        self.screen.blit(cards_text, (INFO_AREA_X + 20, 125))
+        name_text = render_text(self.fonts["player"], self.current_player.name, True, TEXT_COLOR)
+        name_x = INFO_AREA_X + 20 + title_text.get_width()
+        self.screen.blit(name_text, (name_x, INFO_AREA_Y + 4))
 
-        card_y = 150
+        card_x = name_x + name_text.get_width() + 12
         for i, card in enumerate(self.current_player.hand):
             if i >= 2:
                 break
             if card:
-                card_text = self.fonts["card"].render(str(card), True, card.get_color())
-                self.screen.blit(card_text, (INFO_AREA_X + 40, card_y + i * 30))
-
-        chips_text = self.fonts["info"].render(f"Фишки: ${self.current_player.chips}", True, TEXT_COLOR)
-        self.screen.blit(chips_text, (INFO_AREA_X + 20, 210))
-
-        bet_text = self.fonts["info"].render(f"Ставка: ${self.current_player.total_bet}", True, TEXT_COLOR)
-        self.screen.blit(bet_text, (INFO_AREA_X + 20, 235))
+                card_text = render_text(self.fonts["card"], str(card), True, card.get_color())
+                self.screen.blit(card_text, (card_x, INFO_AREA_Y + 1))
+                card_x += card_text.get_width() + 8
 
         status = "Активен"
         if self.current_player.folded:
@@ -252,14 +384,79 @@ class PokerUI:
         elif self.current_player.all_in:
             status = "Ва-банк"
 
-        status_text = self.fonts["info"].render(f"Статус: {status}", True, TEXT_COLOR)
-        self.screen.blit(status_text, (INFO_AREA_X + 20, 260))
+        details_text = render_text(self.fonts["info"],
+            f"Фишки: ${self.current_player.chips}  Ставка: ${self.current_player.total_bet}  {status}",
+            True, TEXT_COLOR
+        )
+        self.screen.blit(details_text, (INFO_AREA_X + 10, INFO_AREA_Y + 32))
+
+    def draw_status(self, dots):
+        pygame.draw.rect(self.screen, (0, 0, 0), STATUS_RECT, border_radius=8)
+        pygame.draw.rect(self.screen, (255, 215, 0), STATUS_RECT, 2, border_radius=8)
+        status_text = render_text(self.fonts["player"], SCENE_STATUS[self.scene] + "." * dots,
+                                  True, TEXT_COLOR)
+        self.screen.blit(status_text, status_text.get_rect(
+            midleft=(STATUS_RECT.centerx - 100, STATUS_RECT.centery)))
+
+    def draw_showdown_info(self):
+        phase_text = render_text(self.fonts["info"], "Фаза: SHOWDOWN - все карты открыты",
+                                 True, (255, 255, 100))
+        self.screen.blit(phase_text, (20, 20))
+
+    def draw_winner_panel(self):
+        winners = self.winners
+        pygame.draw.rect(self.screen, (0, 0, 0, 200), WINNER_RECT)
+        pygame.draw.rect(self.screen, (255, 255, 255, 100), WINNER_RECT, 2)
+
+        if winners:
+            if len(winners) == 1:
+                winner_text = render_text(self.fonts["title"],
+                    f"🏆 ПОБЕДИТЕЛЬ: {winners[0].name} 🏆",
+                    True, (255, 215, 0)
+                )
+                win_amount_text = render_text(self.fonts["info"],
+                    f"Выигрыш: ${self.game.payouts.get(winners[0], 0)}",
+                    True, (255, 255, 255)
+                )
+            else:
+                # С побочными банками выигрыши игроков могут различаться
+                winner_names = ", ".join([w.name for w in winners])
+                if self.game.pots.side_pots:
+                    title = f"🏆 ПОБЕДИТЕЛИ: {winner_names} 🏆"
+                else:
+                    title = f"🤝 НИЧЬЯ: {winner_names} 🤝"
+                winner_text = render_text(self.fonts["title"], title, True, (255, 215, 0))
+                amounts = ", ".join(f"{w.name}: ${self.game.payouts.get(w, 0)}" for w in winners)
+                win_amount_text = render_text(self.fonts["info"],
+                    f"Выигрыши: {amounts}",
+                    True, (255, 255, 255)
+                )
+        else:
+            winner_text = render_text(self.fonts["title"],
+                "ИГРА ЗАВЕРШЕНА",
+                True, (255, 215, 0)
+            )
+            win_amount_text = render_text(self.fonts["info"],
+                "Нет победителей",
+                True, (255, 255, 255)
+            )
 
-    def draw_buttons(self):
-        if not self.current_player:
-            return
+        winner_rect = winner_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 68))
+        self.screen.blit(winner_text, winner_rect)
 
-        buttons = [
+        win_amount_rect = win_amount_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40))
+        self.screen.blit(win_amount_text, win_amount_rect)
+        if self.can_continue():
+            hint = "Нажмите любую кнопку для следующей раздачи, Esc - меню"
+        else:
+            hint = "Нажмите любую кнопку для возврата в меню"
+        continue_text = render_text(self.fonts["info"], hint, True, (200, 200, 200))
+        continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 17))
+        self.screen.blit(continue_text, continue_rect)
+
+    def button_states(self):
+        """Кнопки действий: (надпись, центр, доступна ли)"""
+        return [
             ("FOLD", BUTTONS["fold"], not self.current_player.folded),
             ("CHECK", BUTTONS["check"], self.current_player.total_bet >= self.game.current_bet),
             ("CALL", BUTTONS["call"], self.current_player.total_bet < self.game.current_bet and
@@ -268,9 +465,13 @@ class PokerUI:
             ("ALL-IN", BUTTONS["all_in"], self.current_player.chips > 0),
         ]
 
+    def draw_buttons(self):
+        if not self.current_player:
+            return
+
         mouse_pos = pygame.mouse.get_pos()
 
-        for text, pos, enabled in buttons:
+        for text, pos, enabled in self.button_states():
             button_width = 70
             button_height = 32
             button_rect = pygame.Rect(pos[0] - button_width // 2, pos[1] - button_height // 2, button_width,
@@ -287,30 +488,216 @@ class PokerUI:
             pygame.draw.rect(self.screen, color, button_rect, border_radius=5)
             pygame.draw.rect(self.screen, (0, 0, 0), button_rect, 2, border_radius=5)
 
-            btn_text = self.fonts["button"].render(text, True, TEXT_COLOR)
+            btn_text = render_text(self.fonts["button"], text, True, TEXT_COLOR)
             btn_rect = btn_text.get_rect(center=button_rect.center)
             self.screen.blit(btn_text, btn_rect)
 
     def draw_input_box(self):
         if self.input_active:
-            input_bg = pygame.Rect(CENTER_X - 120, SCREEN_HEIGHT - 180, 240, 40)
+            input_bg = INPUT_RECT.inflate(-4, -4)
             pygame.draw.rect(self.screen, (0, 0, 0, 200), input_bg, border_radius=6)
             pygame.draw.rect(self.screen, (255, 255, 255), input_bg, 2, border_radius=6)
-            input_rect = pygame.Rect(CENTER_X - 100, SCREEN_HEIGHT - 170, 200, 20)
+            hint_text = render_text(self.fonts["info"], "Сумма, затем Enter", True, TEXT_COLOR)
+            hint_rect = hint_text.get_rect(center=(input_bg.centerx, input_bg.y + 13))
+            self.screen.blit(hint_text, hint_rect)
+            input_rect = pygame.Rect(input_bg.x + 10, input_bg.y + 24, input_bg.width - 20, 20)
             pygame.draw.rect(self.screen, (255, 255, 255), input_rect)
             pygame.draw.rect(self.screen, (0, 0, 0), input_rect, 1)
-            input_surface = self.fonts["button"].render(self.input_text, True, (0, 0, 0))
+            input_surface = render_text(self.fonts["button"], self.input_text, True, (0, 0, 0))
             self.screen.blit(input_surface, (input_rect.x + 5, input_rect.y + 2))
-            hint_text = self.fonts["info"].render("Введите сумму и нажмите Enter",
-                                                  True, TEXT_COLOR)
-            hint_rect = hint_text.get_rect(center=(CENTER_X, SCREEN_HEIGHT - 140))
-            self.screen.blit(hint_text, hint_rect)
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    @staticmethod
+    def player_rect(player_x, player_y):
+        """Область, которую занимает игрок: кружок, имя, ставка, статус и карты"""
+        rect = pygame.Rect(player_x - 60, player_y - PLAYER_RADIUS - 26, 120, 2 * PLAYER_RADIUS + 68)
+        card_x, card_y = PokerUI.player_cards_origin(player_x, player_y)
+        cards = pygame.Rect(card_x, card_y, 2 * CARD_WIDTH + CARD_SPACING, CARD_HEIGHT)
+        return rect.union(cards).inflate(4, 4)
+
+    def layers(self):
+        """Слои сцены в порядке отрисовки: (имя, область, состояние, функция рисования).
+
+        Слой перерисовывается, только когда меняется его состояние.
+        """
+        if self.scene == "dealing":
+            # Пока идёт сдача, состояние игры меняется в фоновом потоке
+            return [self.status_layer()]
+
+        game = self.game
+        current = self.current_player
+        if self.scene == "showdown":
+            info = ("info", INFO_RECT, self.scene, self.draw_showdown_info)
+        else:
+            info = ("info", INFO_RECT, (game.game_phase, game.current_bet), self.draw_game_info)
+        layers = [
+            info,
+            ("pot", POT_RECT, game.pot, self.draw_pot),
+            ("community", COMMUNITY_RECT, tuple(card.code for card in game.community_cards),
+             self.draw_community_cards),
+        ]
+
+        for i, player in enumerate(game.players[:len(self.player_rects)]):
+            key = (player.name, player.chips, player.bet, player.folded, player.all_in,
+                   player is current, game.in_hand(player), player.show_cards,
+                   i == game.dealer_position, tuple(card.code for card in player.hand))
+            layers.append((f"player{i}", self.player_rects[i], key,
+                           lambda i=i, player=player: self.draw_player(i, player)))
+
+        if self.scene == "evaluating":
+            layers.append(self.status_layer())
+            return layers
+        if self.scene == "showdown":
+            winners_key = tuple(winner.name for winner in self.winners)
+            layers.append(("winner", WINNER_RECT, winners_key, self.draw_winner_panel))
+            return layers
+
+        if current:
+            current_key = (current.name, current.chips, current.total_bet, current.folded,
+                           current.all_in, tuple(card.code for card in current.hand))
+            mouse_pos = pygame.mouse.get_pos()
+            buttons_key = tuple(
+                (enabled, enabled and pygame.Rect(pos[0] - 35, pos[1] - 16, 70, 32).collidepoint(mouse_pos))
+                for _, pos, enabled in self.button_states()
+            )
+        else:
+            current_key = buttons_key = None
+        layers.append(("current", CURRENT_INFO_RECT, current_key, self.draw_current_player_info))
+        layers.append(("buttons", BUTTONS_RECT, buttons_key, self.draw_buttons))
+        layers.append(("input", INPUT_RECT, (self.input_active, self.input_text), self.draw_input_box))
+        return layers
+
+    def status_layer(self):
+        """Заставка фоновой работы с бегущими точками"""
+        dots = pygame.time.get_ticks() // 300 % 4
+        return ("status", STATUS_RECT, (self.scene, dots), lambda: self.draw_status(dots))
+
+    def render(self):
+        """Перерисовать изменившиеся слои и обновить на экране только их области.
+
+        В каждой грязной области восстанавливается фон и заново рисуются все
+        слои, которые её задевают, - так перекрытия остаются правильными.
+        Возвращает список обновлённых прямоугольников.
+        """
+        layers = self.layers()
+        if self.full_redraw:
+            dirty = [self.screen.get_rect()]
+            self.full_redraw = False
+        else:
+            dirty = [rect for name, rect, key, _ in layers
+                     if name not in self.layer_keys or self.layer_keys[name] != key]
+        self.layer_keys = {name: key for name, _, key, _ in layers}
+
+        for area in dirty:
+            self.screen.set_clip(area)
+            self.screen.blit(self.background, area, area)
+            for _, rect, _, draw in layers:
+                if rect.colliderect(area):
+                    draw()
+        self.screen.set_clip(None)
+
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
+
+    def animating(self):
+        # Пока идёт фоновая задача, крутится заставка
+        return self.task is not None
+
+    def run_in_background(self, func, on_done):
+        """Выполнить func вне потока отрисовки; on_done(результат) вызовет цикл кадров"""
+        self.task = self.worker.submit(func)
+        self.on_task_done = on_done
+        self.full_redraw = True
+
+    def update(self):
+        """Сменить сцену, если фоновая задача завершилась"""
+        if self.task is None or not self.task.done():
+            return
+        task, on_done = self.task, self.on_task_done
+        self.task = self.on_task_done = None
+        on_done(task.result())
+        self.full_redraw = True
+
+    def finish_background(self):
+        """Дождаться фоновой задачи и сменить сцену (для замеров)"""
+        if self.task is not None:
+            self.task.result()
+            self.update()
+
+    def start_hand(self):
+        """Сдать раздачу в фоне, пока окно показывает заставку"""
+        self.scene = "dealing"
+        self.current_player = None
+        self.run_in_background(self.game.start_new_hand, self.on_hand_dealt)
+
+    def on_hand_dealt(self, _):
+        self.scene = "betting"
+        self.current_player = self.game.players[self.game.current_player_index]
+        self.current_player.show_cards = True
+        self.current_player.is_turn = True
+
+    def can_continue(self):
+        """Сессию можно продолжить, пока фишки есть хотя бы у двух игроков"""
+        return len(self.game.players_with_chips()) >= 2
+
+    def next_hand(self):
+        """Следующая раздача той же сессии: игроки, ключи и фишки сохраняются"""
+        self.game.rotate_button()
+        for player in self.game.players:
+            player.is_turn = False
+        self.winners = []
+        self.input_active = False
+        self.input_text = ""
+        self.hands_played += 1
+        logger.info("Раздача %d, дилер: %s", self.hands_played,
+                    self.game.players[self.game.dealer_position].name,
+                    extra={"hand": self.hands_played})
+        self.start_hand()
+
+    def close(self):
+        """Остановить фоновые потоки интерфейса и игры (окно остаётся открытым)"""
+        self.worker.shutdown(wait=True, cancel_futures=True)
+        self.game.close()
+
+    def start_showdown(self):
+        """Открыть карты и определить победителя в фоне"""
+        for player in self.game.active_players:
+            if not player.folded:
+                player.show_cards = True
+        self.scene = "evaluating"
+        self.input_active = False
+        self.run_in_background(self.game.determine_winner, self.on_winners)
+
+    def on_winners(self, winners):
+        logger.info("Победители: %s", ", ".join(w.name for w in winners),
+                    extra={"winners": [w.name for w in winners]})
+        self.winners = winners
+        for player in self.game.players:
+            player.show_cards = True
+        self.scene = "showdown"
+
+    def handle_events(self, events):
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
 
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                self.full_redraw = True
+
+            elif self.scene == "showdown":
+                if event.type not in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                    continue
+                if self.can_continue() and not (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    self.next_hand()
+                else:
+                    logger.debug("Нажата кнопка - возвращаемся в меню")
+                    self.return_to_menu = True
+                    self.running = False
+
+            elif self.scene != "betting":
+                # Во время сдачи и подсчёта ввод не принимается
+                continue
+
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1 and not self.input_active:
                     self.handle_button_click(event.pos)
@@ -352,40 +739,41 @@ class PokerUI:
         if not self.current_player:
             return
 
-        print(f"Действие: {action} от {self.current_player.name}")
+        logger.debug("Действие: %s от %s", action, self.current_player.name,
+                     extra={"action": action, "player": self.current_player.name})
 
         success = False
 
         if action == "fold":
             success = self.game.player_action(self.current_player, "fold")
             if success:
-                print(f"{self.current_player.name} сбросил карты")
+                logger.info("%s сбросил карты", self.current_player.name)
                 self.switch_to_next_player()
 
         elif action == "check":
             success = self.game.player_action(self.current_player, "check")
             if success:
-                print(f"{self.current_player.name} сделал чек")
+                logger.info("%s сделал чек", self.current_player.name)
                 self.switch_to_next_player()
             else:
-                print(f"{self.current_player.name} не может сделать чек (нужен колл)")
+                logger.info("%s не может сделать чек (нужен колл)", self.current_player.name)
 
         elif action == "call":
             success = self.game.player_action(self.current_player, "call")
             if success:
-                print(f"{self.current_player.name} сделал колл")
+                logger.info("%s сделал колл", self.current_player.name)
                 self.switch_to_next_player()
 
         elif action == "raise":
             self.input_active = True
             self.input_text = ""
-            print(f"{self.current_player.name} хочет повысить ставку")
+            logger.debug("%s хочет повысить ставку", self.current_player.name)
             # Ход не передается - ждем ввода суммы
 
         elif action == "all_in":
             success = self.game.player_action(self.current_player, "all_in")
             if success:
-                print(f"{self.current_player.name} пошел ва-банк")
+                logger.info("%s пошел ва-банк", self.current_player.name)
                 self.switch_to_next_player()
 
     def switch_to_next_player(self):
@@ -412,33 +800,18 @@ class PokerUI:
             # Критически важно: проверяем завершение раунда ДО сравнения игроков
             if self.game.check_round_complete():
                 # Раунд торгов завершен - переходим к следующей фазе
-                print(f"Раунд торгов завершен. Переход к следующей фазе из {self.game.game_phase}")
+                logger.info("Раунд торгов завершен. Переход к следующей фазе из %s", self.game.game_phase)
 
                 can_continue = self.game.next_phase()
 
                 if not can_continue or self.game.game_phase == "showdown":
                     # Это showdown или следующая фаза недоступна
-                    print("SHOWDOWN! Определение победителя...")
-
-                    # Показываем карты всех игроков
-                    for player in self.game.active_players:
-                        if not player.folded:
-                            player.show_cards = True
-
-                    # Определяем победителя
-                    winners = self.game.determine_winner()
-
-                    # Показываем экран победителя
-                    self.show_winner_screen(winners)
-                    pygame.time.delay(2000)
-
-                    # Возвращаемся в меню
-                    self.return_to_menu = True
-                    self.running = False
+                    logger.info("SHOWDOWN! Определение победителя")
+                    self.start_showdown()
                     return
                 else:
                     # Успешно перешли к следующей фазе
-                    print(f"Новая фаза: {self.game.game_phase}")
+                    logger.info("Новая фаза: %s", self.game.game_phase)
 
                     # Скрываем карты всех игроков
                     for player in self.game.players:
@@ -455,128 +828,22 @@ class PokerUI:
                 can_continue = self.game.next_phase()
 
                 if not can_continue or self.game.game_phase == "showdown":
-                    print("SHOWDOWN (нет следующего игрока)! Определение победителя...")
-
-                    # Показываем карты всех игроков
-                    for player in self.game.active_players:
-                        if not player.folded:
-                            player.show_cards = True
-
-                    winners = self.game.determine_winner()
-                    self.show_winner_screen(winners)
-                    pygame.time.delay(2000)
-
-                    self.return_to_menu = True
-                    self.running = False
-
-    def show_winner_screen(self, winners):
-        """Показать победителя и карты всех игроков на игровом столе"""
-        print("=== show_winner_screen вызван ===")
-
-        for player in self.game.players:
-            player.show_cards = True
-            print(f"Показали карты {player.name} в финале")
-
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    pygame.quit()
-                    sys.exit()
-                elif event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
-                    print("Нажата кнопка - возвращаемся в меню")
-                    self.return_to_menu = True
-                    self.running = False
-                    return
-
-            self.screen.fill(BACKGROUND)
-
-            table_rect = pygame.Rect(
-                SCREEN_WIDTH // 4,
-                SCREEN_HEIGHT // 4,
-                SCREEN_WIDTH // 2,
-                SCREEN_HEIGHT // 2
-            )
-            pygame.draw.ellipse(self.screen, TABLE_COLOR, table_rect)
-            pygame.draw.ellipse(self.screen, TABLE_BORDER, table_rect, 5)
-            center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-            pygame.draw.circle(self.screen, (50, 50, 50), (center_x, center_y), 60)
-            pot_text = self.fonts["title"].render(f"${self.game.pot}", True, (255, 215, 0))
-            pot_rect = pot_text.get_rect(center=(center_x, center_y))
-            self.screen.blit(pot_text, pot_rect)
-            self.draw_community_cards()
-
-            self.draw_players()
-
-            winner_panel = pygame.Rect(0, SCREEN_HEIGHT - 150, SCREEN_WIDTH, 150)
-            pygame.draw.rect(self.screen, (0, 0, 0, 200), winner_panel)
-            pygame.draw.rect(self.screen, (255, 255, 255, 100), winner_panel, 2)
-
-            if winners:
-                if len(winners) == 1:
-                    winner_text = self.fonts["title"].render(
-                        f"🏆 ПОБЕДИТЕЛЬ: {winners[0].name} 🏆",
-                        True, (255, 215, 0)
-                    )
-                    win_amount_text = self.fonts["info"].render(
-                        f"Выигрыш: ${self.game.pot}",
-                        True, (255, 255, 255)
-                    )
-                else:
-                    winner_names = ", ".join([w.name for w in winners])
-                    winner_text = self.fonts["title"].render(
-                        f"🤝 НИЧЬЯ: {winner_names} 🤝",
-                        True, (255, 215, 0)
-                    )
-                    win_amount_text = self.fonts["info"].render(
-                        f"Каждый получает: ${self.game.pot // len(winners)}",
-                        True, (255, 255, 255)
-                    )
-            else:
-                winner_text = self.fonts["title"].render(
-                    "ИГРА ЗАВЕРШЕНА",
-                    True, (255, 215, 0)
-                )
-                win_amount_text = self.fonts["info"].render(
-                    "Нет победителей",
-                    True, (255, 255, 255)
-                )
-
-            winner_rect = winner_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 120))
-            self.screen.blit(winner_text, winner_rect)
-
-            win_amount_rect = win_amount_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 85))
-            self.screen.blit(win_amount_text, win_amount_rect)
-            continue_text = self.fonts["info"].render(
-                "Нажмите любую кнопку для возврата в меню",
-                True, (200, 200, 200)
-            )
-            continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
-            self.screen.blit(continue_text, continue_rect)
-
-            phase_text = self.fonts["info"].render(
-                f"Фаза: SHOWDOWN - все карты открыты",
-                True, (255, 255, 100)
-            )
-            self.screen.blit(phase_text, (20, 20))
-
-            pygame.display.flip()
-            self.clock.tick(60)
+                    logger.info("SHOWDOWN (нет следующего игрока)! Определение победителя")
+                    self.start_showdown()
 
     def run(self):
-        print("=== Игра началась ===")
+        logger.info("Игра началась")
         while self.running:
-            self.handle_events()
+            self.update()
 
-            self.draw_table()
-            self.draw_community_cards()
-            self.draw_players()
-            self.draw_current_player_info()
-            self.draw_buttons()
-            self.draw_input_box()
+            start = time.perf_counter_ns() if METRICS.enabled else 0
+            self.render()
+            if start:
+                METRICS.observe("frame", time.perf_counter_ns() - start)
 
-            pygame.display.flip()
-            self.clock.tick(60)
+            # В статичной сцене здесь цикл спит до ввода
+            self.handle_events(self.frame_policy.events(self.clock, self.animating()))
 
-        pygame.quit()
-        return getattr(self, 'return_to_menu', False)
+        # Окно и pygame живут дольше одного стола - их закрывает main
+        self.close()
+        return self.return_to_menu